@@ -2,52 +2,31 @@
 # This module contains the agent graph and state management
 
 import os
-from typing import TypedDict, Annotated
+import json
+import asyncio
+import operator
+from functools import lru_cache
+from typing import TypedDict, Annotated, List, Literal
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.types import Command
 from tools import get_tools
 
 
-class AgentState(TypedDict):
-    """State definition for the research agent"""
-    messages: Annotated[list, add_messages]
-
-
-def create_agent():
-    """
-    Create and compile the research agent graph with LLM decision-making
-    
-    Returns:
-        Compiled LangGraph agent
-    """
-    # Initialize LLM
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY environment variable is not set")
-    
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0,
-        google_api_key=api_key
-    )
-    
-    # Get available tools
-    tools = get_tools()
-    
-    # Bind tools to LLM
-    llm_with_tools = llm.bind_tools(tools)
-    
-    # System prompt to guide agent behavior
-    system_prompt = """You are an expert research assistant that provides complete, detailed answers by automatically gathering all necessary information.
+# System prompt to guide agent behavior
+SYSTEM_PROMPT = """You are an expert research assistant that provides complete, detailed answers by automatically gathering all necessary information.
 
 ## Core Principle: COMPLETE RESEARCH AUTOMATICALLY
 You MUST fetch and read actual content from sources. NEVER just provide links or suggest the user read something. The user expects a COMPLETE answer based on actual content you've read.
 
 ## Your Workflow (ALWAYS FOLLOW):
 1. **Search** - Use appropriate search tool to find sources
-2. **Fetch Content** - AUTOMATICALLY use fetch_url_content to read the actual content from top URLs
+2. **Fetch Content** - AUTOMATICALLY use fetch_urls_content to read the actual content from top URLs in one call
 3. **Synthesize** - Provide comprehensive answer based on the content you read
 
 ## Critical Rules:
@@ -62,7 +41,7 @@ You MUST fetch and read actual content from sources. NEVER just provide links or
 
 ### For Web/News Queries:
 1. Use tavily_search to find URLs
-2. IMMEDIATELY use fetch_url_content on top 2-3 URLs
+2. IMMEDIATELY use fetch_urls_content on the top 2-3 URLs (one call for all of them)
 3. Synthesize answer from the fetched content
 
 ### For Academic Queries:
@@ -76,9 +55,8 @@ You MUST fetch and read actual content from sources. NEVER just provide links or
 ## Example Good Behavior:
 User: "Latest AI news"
 1. tavily_search("latest AI news") → Gets URLs
-2. fetch_url_content(url1) → Read article 1
-3. fetch_url_content(url2) → Read article 2  
-4. Provide comprehensive summary of what you read
+2. fetch_urls_content([url1, url2]) → Read both articles at once
+3. Provide comprehensive summary of what you read
 
 ## Example Bad Behavior (NEVER DO THIS):
 User: "Latest AI news"
@@ -107,18 +85,29 @@ You provide accurate, well-researched answers by intelligently selecting and com
 - Same use cases as Tavily
 - Free and unlimited
 
+**multi_source_search** (PARALLEL MULTI-SOURCE SEARCH)
+- Searches several sources at once: tavily, wikipedia, arxiv, pubmed, duckduckgo
+- Use whenever a query needs more than one search tool - one call instead of several
+- Pick only the sources the query needs via the sources argument
+
 **fetch_url_content** (URL READER)
 - Reading specific webpage content
 - Use ONLY when user provides a URL or when you need to read a specific page found via search
 - NOT for general searches
 - Keywords: User provides URL like "http://", "https://", "www."
 
+**fetch_urls_content** (MULTI-URL READER)
+- Reading several webpages at once, fetched in parallel
+- Use after a search to read the top 2-3 result URLs in a single call
+- Prefer this over calling fetch_url_content several times
+
 ### Academic Research Tools
 **wikipedia_search** (GENERAL KNOWLEDGE)
 - Definitions, concepts, overviews, background information
 - Historical facts, biographies, general topics
 - Foundation knowledge before deeper research
 - Keywords: "what is", "who is", "define", "explain", "overview", "history of"
+- For several topics at once, use **wikipedia_search_batch**(queries=[...])
 
 **arxiv_search** (CS/PHYSICS/MATH PAPERS)
 - Computer science research papers
@@ -126,6 +115,7 @@ You provide accurate, well-researched answers by intelligently selecting and com
 - Machine learning, AI research
 - Returns abstracts and summaries (not full text)
 - Keywords: "research papers", "arxiv", "computer science", "physics", "ML", "AI research"
+- For several subtopics at once, use **arxiv_search_batch**(queries=[...])
 
 **pubmed_search** (MEDICAL/BIOLOGY RESEARCH)
 - Medical research papers and clinical studies
@@ -133,6 +123,7 @@ You provide accurate, well-researched answers by intelligently selecting and com
 - Drug information and treatment studies
 - Returns abstracts and citations (not full text)
 - Keywords: "medical", "disease", "treatment", "drug", "clinical", "health", "biology"
+- For several subtopics at once, use **pubmed_search_batch**(queries=[...])
 
 **pdf_extract** (FULL PAPER TEXT)
 - Extract complete text from PDF research papers
@@ -151,6 +142,7 @@ You provide accurate, well-researched answers by intelligently selecting and com
 - Running Python code and getting output/results
 - Use when user asks "what's the output", "run this code", "execute this"
 - Runs code safely in E2B sandbox environment
+- Each call starts from a clean interpreter: include all imports and variables in the same snippet
 - Keywords: "run code", "execute", "what's the output", "test this code"
 ### Multimedia Tools
 **youtube_transcript** (VIDEO CONTENT)
@@ -188,8 +180,8 @@ Use multiple tools ONLY when:
 3. Query asks for BOTH general knowledge AND specific research
 
 Example good multi-tool uses:
-- "What is quantum computing and what are the latest developments?" → wikipedia_search + tavily_search
-- "Explain COVID-19 and show recent research" → wikipedia_search + pubmed_search
+- "What is quantum computing and what are the latest developments?" → multi_source_search(sources=["wikipedia", "tavily"])
+- "Explain COVID-19 and show recent research" → multi_source_search(sources=["wikipedia", "pubmed"])
 
 ### What NOT to Do
 ❌ Don't use web search for academic papers (use arxiv/pubmed instead)
@@ -234,36 +226,156 @@ User: "What is cancer and what are recent treatment developments?"
 
 ## Remember
 You are a RESEARCH assistant, not a general chatbot. Your strength is finding and synthesizing information from authoritative sources. Use your tools wisely, be selective, and always provide value through well-researched answers."""
+
+class MessageCache(InMemoryCache):
+    """
+    In-memory LLM cache keyed on message content rather than message ids
+    
+    LangGraph stamps a fresh id on every message, and the serialized prompt the
+    chat model hands the cache includes those ids (and the per-run tool call ids),
+    so identical conversations would otherwise never share a key.
+    """
+    
+    @staticmethod
+    def _strip_ids(prompt: str) -> str:
+        try:
+            messages = json.loads(prompt)
+        except ValueError:
+            return prompt
+        if not isinstance(messages, list):
+            return prompt
+        for message in messages:
+            kwargs = message.get("kwargs") if isinstance(message, dict) else None
+            if not isinstance(kwargs, dict):
+                continue
+            kwargs.pop("id", None)
+            kwargs.pop("tool_call_id", None)
+            for field in ("tool_calls", "invalid_tool_calls", "tool_call_chunks"):
+                for call in kwargs.get(field) or []:
+                    if isinstance(call, dict):
+                        call.pop("id", None)
+        return json.dumps(messages, sort_keys=True)
+    
+    def lookup(self, prompt, llm_string):
+        return super().lookup(self._strip_ids(prompt), llm_string)
+    
+    def update(self, prompt, llm_string, return_val):
+        super().update(self._strip_ids(prompt), llm_string, return_val)
+
+
+# Built once and reused for every request
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+
+class AgentState(TypedDict):
+    """State definition for the research agent"""
+    messages: Annotated[list, add_messages]
+    tools_used: Annotated[List[str], operator.add]
+
+
+def create_initial_state(query: str) -> AgentState:
+    """
+    Build the initial graph state for a user query
+    
+    Args:
+        query: The user's research question
+    
+    Returns:
+        State with the system prompt and the user message
+    """
+    return {"messages": [SYSTEM_MESSAGE, HumanMessage(content=query)], "tools_used": []}
+
+
+def create_agent():
+    """
+    Create and compile the research agent graph with LLM decision-making
+    
+    The graph is built once per process; later calls return the same instance.
     
-    def agent_node(state: AgentState):
+    Returns:
+        Compiled LangGraph agent
+    """
+    return _build_agent()
+
+
+@lru_cache(maxsize=1)
+def _build_agent():
+    """Build the LLM client, bind the tools and compile the graph"""
+    # Initialize LLM
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY environment variable is not set")
+    
+    # Serve repeated identical LLM calls from memory (safe since temperature=0)
+    set_llm_cache(MessageCache(maxsize=2048))
+    
+    # One client for the process lifetime so concurrent calls share its warm connections
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=0,
+        google_api_key=api_key,
+        timeout=60,  # Fail a stuck request instead of holding a connection forever
+        max_retries=2
+    )
+    
+    # Get available tools
+    tools = get_tools()
+    tool_map = {t.name: t for t in tools}
+    
+    # Bind tools to LLM
+    llm_with_tools = llm.bind_tools(tools)
+    
+    async def agent_node(state: AgentState) -> Command[Literal["tools", "__end__"]]:
         """Agent node where LLM decides which tools to call"""
         messages = state["messages"]
         
-        # Add system prompt to the first message if not already present
-        if not any(hasattr(m, 'type') and m.type == 'system' for m in messages):
-            from langchain_core.messages import SystemMessage
-            messages = [SystemMessage(content=system_prompt)] + messages
+        # Callers should start from create_initial_state; only prepend as a fallback
+        if not messages or getattr(messages[0], 'type', None) != 'system':
+            messages = [SYSTEM_MESSAGE, *messages]
+        
+        response = await llm_with_tools.ainvoke(messages)
+        
+        # Route in the same update: a final answer ends the run without a separate edge check
+        return Command(
+            update={"messages": [response]},
+            goto="tools" if response.tool_calls else END
+        )
+    
+    async def tool_node(state: AgentState, config: RunnableConfig):
+        """Tool node that runs all tool calls from the last LLM turn concurrently"""
+        tool_calls = state["messages"][-1].tool_calls
+        
+        async def run_tool(tool_call):
+            selected_tool = tool_map.get(tool_call["name"])
+            if selected_tool is None:
+                return f"Error: {tool_call['name']} is not a valid tool"
+            try:
+                return await selected_tool.ainvoke(tool_call["args"], config)
+            except Exception as e:
+                return f"Error running {tool_call['name']}: {str(e)}"
+        
+        # Latency is max(tool_i) instead of sum(tool_i) for parallel calls
+        results = await asyncio.gather(*(run_tool(tc) for tc in tool_calls))
         
-        response = llm_with_tools.invoke(messages)
-        return {"messages": [response]}
+        return {
+            "messages": [
+                ToolMessage(content=str(result), name=tc["name"], tool_call_id=tc["id"])
+                for tc, result in zip(tool_calls, results)
+            ],
+            "tools_used": [tc["name"] for tc in tool_calls]
+        }
     
     # Create the graph
     workflow = StateGraph(AgentState)
     
     # Add nodes
     workflow.add_node("agent", agent_node)
-    workflow.add_node("tools", ToolNode(tools))
+    workflow.add_node("tools", tool_node)
     
     # Set entry point
     workflow.set_entry_point("agent")
     
-    # Add conditional edges
-    # After agent, either go to tools or end
-    workflow.add_conditional_edges(
-        "agent",
-        tools_condition,
-    )
-    
+    # The agent node routes itself to tools or END via Command
     # After tools, always go back to agent
     workflow.add_edge("tools", "agent")
     
@@ -0,0 +1,101 @@
+"""
+Research Agent - Disk Cache
+Fingerprint-keyed on-disk memoization for expensive tool calls
+"""
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Callable, Optional
+
+import diskcache
+
+logger = logging.getLogger(__name__)
+
+# Shared across processes and restarts; override with RESEARCH_CACHE_DIR
+CACHE_DIR = os.getenv("RESEARCH_CACHE_DIR", os.path.join(tempfile.gettempdir(), "research_cache"))
+
+
+@lru_cache(maxsize=1)
+def get_cache() -> diskcache.Cache:
+    """Open the on-disk cache once per process"""
+    return diskcache.Cache(CACHE_DIR)
+
+
+def fingerprint(namespace: str, value: str) -> str:
+    """Return the SHA256 cache key for a value within a namespace"""
+    return hashlib.sha256(f"{namespace}:{value}".encode("utf-8")).hexdigest()
+
+
+def disk_cached(
+    namespace: str,
+    ttl_hours: float = 24,
+    key: Optional[Callable[..., str]] = None,
+    should_cache: Optional[Callable[[Any], bool]] = None,
+    memory_entries: int = 0
+):
+    """
+    Memoize a function's result on disk
+
+    Only returned values are stored; if the function raises, nothing is cached
+    and the exception propagates. should_cache can also reject a returned value.
+    With memory_entries set, the most recently used results are also kept in
+    process so repeat calls skip the disk read; they expire with the disk entry.
+
+    Args:
+        namespace: Cache namespace, usually the tool name
+        ttl_hours: How long a cached result stays valid
+        key: Builds the fingerprint input from the call arguments (default: repr of the arguments)
+        should_cache: Decides whether a result is stored (default: store everything)
+        memory_entries: Most results also kept in process memory (default: none)
+    """
+    def decorator(func):
+        # cache_key -> (wall-clock expiry, value), least recently used first
+        memory: "OrderedDict[str, tuple]" = OrderedDict()
+        memory_lock = threading.Lock()
+
+        def remember(cache_key: str, expires_at: float, value: Any):
+            if not memory_entries:
+                return
+            with memory_lock:
+                memory[cache_key] = (expires_at, value)
+                memory.move_to_end(cache_key)
+                while len(memory) > memory_entries:
+                    memory.popitem(last=False)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            raw_key = key(*args, **kwargs) if key else repr((args, sorted(kwargs.items())))
+            cache_key = fingerprint(namespace, raw_key)
+
+            if memory_entries:
+                with memory_lock:
+                    entry = memory.get(cache_key)
+                    if entry is not None:
+                        if entry[0] > time.time():
+                            memory.move_to_end(cache_key)
+                            logger.info("MEMORY CACHE HIT | %s", namespace)
+                            return entry[1]
+                        del memory[cache_key]
+
+            cache = get_cache()
+            cached, expires_at = cache.get(cache_key, expire_time=True)
+            if cached is not None:
+                logger.info("DISK CACHE HIT | %s", namespace)
+                # diskcache uses wall-clock expiry times, so the memory copy expires with it
+                remember(cache_key, expires_at or time.time() + ttl_hours * 3600, cached)
+                return cached
+
+            result = func(*args, **kwargs)
+            if should_cache is None or should_cache(result):
+                cache.set(cache_key, result, expire=ttl_hours * 3600)
+                remember(cache_key, time.time() + ttl_hours * 3600, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -4,60 +4,108 @@ Provides API endpoints for the research agent with logging and analytics
 """
 import os
 import json
+import queue
 import logging
+import logging.handlers
+import itertools
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, StringConstraints
+import anyio
 import asyncio
 from pathlib import Path
 
 # Import the research agent
-from agent import create_agent
-from langchain_core.messages import HumanMessage
+from agent import create_agent, create_initial_state
+from semantic_cache import SemanticCache, get_embedder, query_details
+
+# Keep recent log records in memory so /api/logs never has to read the file
+class LogRingHandler(logging.Handler):
+    """Logging handler that keeps the most recent parsed records in a ring buffer"""
+    
+    def __init__(self, capacity: int = 1000):
+        super().__init__()
+        self.buffer = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter())
+    
+    def emit(self, record):
+        try:
+            self.buffer.append({
+                "timestamp": self.formatter.formatTime(record),
+                "level": record.levelname,
+                "message": record.getMessage()
+            })
+        except Exception:
+            self.handleError(record)
+    
+    def recent(self, count: int) -> List[Dict]:
+        """Return the last `count` entries, oldest first"""
+        self.acquire()
+        try:
+            start = max(len(self.buffer) - count, 0)
+            return list(itertools.islice(self.buffer, start, None))
+        finally:
+            self.release()
+    
+    def clear(self):
+        """Drop all buffered entries"""
+        self.acquire()
+        try:
+            self.buffer.clear()
+        finally:
+            self.release()
 
 # Configure logging
+# Records are only enqueued on the request path; a background thread does the file/console writes
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler('agent.log', mode='a', encoding='utf-8')
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, stream_handler, respect_handler_level=True
+)
+
+# The queue handler must only merge args into the message; the listener's handlers do the formatting
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+ring_handler = LogRingHandler(capacity=1000)
+
+# force=True replaces the file handler tools.py installs when it is imported
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('agent.log', mode='a', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler, ring_handler],
+    force=True
 )
+log_listener.start()
 
-# Filter out uvicorn reload messages
-class NoReloadFilter(logging.Filter):
-    def filter(self, record):
-        # Filter out uvicorn reload messages
-        if 'change detected' in record.getMessage().lower():
-            return False
-        if 'reloading' in record.getMessage().lower():
-            return False
-        if 'watchfiles' in record.getMessage().lower():
-            return False
-        return True
-
-# Apply filter to all handlers
 logger = logging.getLogger(__name__)
-for handler in logging.getLogger().handlers:
-    handler.addFilter(NoReloadFilter())
 
-# Also filter uvicorn logger specifically
-uvicorn_logger = logging.getLogger("uvicorn")
-uvicorn_logger.addFilter(NoReloadFilter())
+# Separator line between requests in the log, built once
+LOG_SEPARATOR = "=" * 60
 
-# Filter watchfiles logger
-watchfiles_logger = logging.getLogger("watchfiles")
-watchfiles_logger.setLevel(logging.WARNING)
+# Silence reload/file-watcher chatter at the logger level instead of filtering every record
+logging.getLogger("watchfiles").setLevel(logging.ERROR)
+logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
+logging.getLogger("uvicorn.access").disabled = True
 
 # Request/Response Models
+MAX_QUERY_LENGTH = 4000
+LOGGED_QUERY_LENGTH = 500
+
 class ResearchRequest(BaseModel):
-    query: str
+    # Oversized or blank queries are rejected with a 422 before any work is done
+    query: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=MAX_QUERY_LENGTH)]
     session_id: Optional[str] = None
 
 class ResearchResponse(BaseModel):
@@ -87,11 +135,19 @@ class AnalyticsResponse(BaseModel):
 query_analytics = {
     "total_queries": 0,
     "tools_usage": {},
-    "processing_times": [],
-    "recent_queries": [],
+    "processing_times": deque(maxlen=1000),  # Rolling window for the average
+    "processing_time_sum": 0.0,  # Running sum over the window
+    "recent_queries": deque(maxlen=10),
     "start_time": datetime.now()
 }
 
+# update_analytics runs in background worker threads
+analytics_lock = threading.Lock()
+
+# Paraphrased queries reuse earlier answers; kept short-lived since news goes stale
+response_cache = SemanticCache(threshold=0.95, ttl_seconds=3600)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
@@ -103,12 +159,19 @@ async def lifespan(app: FastAPI):
         research_agent = create_agent()
         logger.info("✅ Research Agent initialized successfully")
     except Exception as e:
-        logger.error(f"❌ Failed to initialize agent: {e}")
+        logger.error("❌ Failed to initialize agent: %s", e)
         raise
     
+    # Warm the embedding model so the first query doesn't pay the load time
+    if get_embedder() is not None:
+        logger.info("✅ Semantic cache ready")
+    
     yield
     
     logger.info("🛑 Research Agent API shutting down...")
+    
+    # Flush queued log records to disk
+    log_listener.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -130,44 +193,55 @@ app.add_middleware(
 # Global agent instance
 research_agent = None
 
-def extract_tools_from_messages(messages) -> List[str]:
-    """Extract tool names from agent messages"""
-    tools_used = []
-    for message in messages:
-        if hasattr(message, 'tool_calls') and message.tool_calls:
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.get('name', 'unknown_tool')
-                if tool_name not in tools_used:
-                    tools_used.append(tool_name)
-    return tools_used
-
 def estimate_tokens(text: str) -> int:
     """Rough token estimation (1 token ≈ 4 characters)"""
     return len(text) // 4
 
+def message_text(message) -> str:
+    """Text of an AI message whose content is a string or a list of content parts"""
+    content = getattr(message, 'content', None) or ""
+    if isinstance(content, str):
+        return content
+    
+    # Keep plain strings and text blocks; skip images, tool-use and other block types
+    parts = []
+    for part in content:
+        if isinstance(part, str):
+            parts.append(part)
+        elif isinstance(part, dict) and isinstance(part.get('text'), str):
+            parts.append(part['text'])
+    return "".join(parts)
+
+def format_sse(data: Dict) -> str:
+    """Format a payload as a Server-Sent Events data frame"""
+    return f"data: {json.dumps(data)}\n\n"
+
 def update_analytics(query: str, tools_used: List[str], processing_time: float, session_id: str):
     """Update global analytics"""
-    global query_analytics
-    
-    query_analytics["total_queries"] += 1
-    query_analytics["processing_times"].append(processing_time)
-    
-    # Update tools usage
-    for tool in tools_used:
-        query_analytics["tools_usage"][tool] = query_analytics["tools_usage"].get(tool, 0) + 1
-    
-    # Add to recent queries (keep last 10)
-    query_analytics["recent_queries"].insert(0, {
+    recent_query = {
         "query": query[:100] + "..." if len(query) > 100 else query,
         "tools_used": tools_used,
         "processing_time": processing_time,
         "timestamp": datetime.now().isoformat(),
         "session_id": session_id
-    })
+    }
     
-    # Keep only last 10 queries
-    if len(query_analytics["recent_queries"]) > 10:
-        query_analytics["recent_queries"] = query_analytics["recent_queries"][:10]
+    with analytics_lock:
+        query_analytics["total_queries"] += 1
+        
+        # Keep the running sum in step with the window; subtract the value the deque evicts
+        times = query_analytics["processing_times"]
+        if len(times) == times.maxlen:
+            query_analytics["processing_time_sum"] -= times[0]
+        times.append(processing_time)
+        query_analytics["processing_time_sum"] += processing_time
+        
+        # Update tools usage
+        for tool in tools_used:
+            query_analytics["tools_usage"][tool] = query_analytics["tools_usage"].get(tool, 0) + 1
+        
+        # Add to recent queries (deque keeps only the last 10)
+        query_analytics["recent_queries"].appendleft(recent_query)
 
 @app.get("/api/health")
 async def health_check():
@@ -188,52 +262,61 @@ async def research_query(request: ResearchRequest, background_tasks: BackgroundT
     session_id = request.session_id or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     start_time = datetime.now()
     
-    logger.info(f"=" * 60)
-    logger.info(f"NEW RESEARCH QUERY | SESSION: {session_id}")
-    logger.info(f"QUERY: {request.query}")
-    logger.info(f"=" * 60)
+    logger.info(LOG_SEPARATOR)
+    logger.info("NEW RESEARCH QUERY | SESSION: %s", session_id)
+    logger.info("QUERY: %s", request.query[:LOGGED_QUERY_LENGTH])
+    logger.info(LOG_SEPARATOR)
     
     try:
+        # Serve paraphrases of earlier queries from the semantic cache
+        query_embedding = await asyncio.to_thread(response_cache.embed, request.query)
+        query_tag = query_details(request.query)
+        if query_embedding is not None:
+            cached = response_cache.lookup(query_embedding, tag=query_tag)
+            if cached is not None:
+                processing_time = (datetime.now() - start_time).total_seconds()
+                logger.info("RESEARCH SERVED FROM CACHE | SESSION: %s", session_id)
+                logger.info(LOG_SEPARATOR)
+                background_tasks.add_task(update_analytics, request.query, cached.tools_used, processing_time, session_id)
+                return cached.model_copy(update={
+                    "session_id": session_id,
+                    "processing_time": processing_time,
+                    "timestamp": datetime.now()
+                })
+        
         # Create initial state
-        initial_state = {
-            "messages": [HumanMessage(content=request.query)]
-        }
+        initial_state = create_initial_state(request.query)
         
-        # Run the agent
-        result = research_agent.invoke(initial_state)
+        # Run the agent without blocking the event loop
+        result = await research_agent.ainvoke(initial_state)
         
         # Extract final answer
         final_message = result["messages"][-1]
         
-        if hasattr(final_message, 'content'):
-            if isinstance(final_message.content, list):
-                answer = ""
-                for item in final_message.content:
-                    if isinstance(item, dict) and 'text' in item:
-                        answer += item['text']
-                    elif isinstance(item, str):
-                        answer += item
-            else:
-                answer = final_message.content
-        else:
+        answer = message_text(final_message)
+        answered = bool(answer)
+        if not answered:
             answer = "No response generated"
         
-        # Extract tools used
-        tools_used = extract_tools_from_messages(result["messages"])
+        # Tools used are accumulated in the graph state (deduplicated, in call order)
+        tools_used = list(dict.fromkeys(result.get("tools_used", [])))
         
         # Calculate processing time
         processing_time = (datetime.now() - start_time).total_seconds()
         
-        # Estimate tokens
-        total_text = request.query + answer + str(result["messages"])
-        token_estimate = estimate_tokens(total_text)
+        # Sum the token usage reported by every LLM turn, estimate only if missing
+        token_estimate = sum(
+            m.usage_metadata.get('total_tokens', 0)
+            for m in result["messages"]
+            if getattr(m, 'usage_metadata', None)
+        ) or estimate_tokens(answer)
         
-        logger.info(f"RESEARCH COMPLETED | SESSION: {session_id}")
-        logger.info(f"TOOLS USED: {', '.join(tools_used)}")
-        logger.info(f"PROCESSING TIME: {processing_time:.2f}s")
-        logger.info(f"TOKEN ESTIMATE: {token_estimate}")
-        logger.info(f"ANSWER LENGTH: {len(answer)} chars")
-        logger.info(f"=" * 60)
+        logger.info("RESEARCH COMPLETED | SESSION: %s", session_id)
+        logger.info("TOOLS USED: %s", ', '.join(tools_used))
+        logger.info("PROCESSING TIME: %.2fs", processing_time)
+        logger.info("TOKEN ESTIMATE: %s", token_estimate)
+        logger.info("ANSWER LENGTH: %d chars", len(answer))
+        logger.info(LOG_SEPARATOR)
         
         # Update analytics in background
         background_tasks.add_task(
@@ -244,7 +327,7 @@ async def research_query(request: ResearchRequest, background_tasks: BackgroundT
             session_id
         )
         
-        return ResearchResponse(
+        response = ResearchResponse(
             success=True,
             answer=answer,
             session_id=session_id,
@@ -254,80 +337,118 @@ async def research_query(request: ResearchRequest, background_tasks: BackgroundT
             token_estimate=token_estimate
         )
         
+        # Only cache real answers, never the fallback text
+        if query_embedding is not None and answered:
+            response_cache.store(query_embedding, response, tag=query_tag)
+        
+        return response
+        
     except Exception as e:
-        logger.error(f"RESEARCH FAILED | SESSION: {session_id} | ERROR: {str(e)}")
-        logger.info(f"=" * 60)
+        logger.error("RESEARCH FAILED | SESSION: %s | ERROR: %s", session_id, e)
+        logger.info(LOG_SEPARATOR)
         
         raise HTTPException(
             status_code=500,
             detail=f"Research failed: {str(e)}"
         )
 
+@app.post("/api/research/stream")
+async def research_query_stream(request: ResearchRequest):
+    """Streaming research endpoint (Server-Sent Events)"""
+    if not research_agent:
+        raise HTTPException(status_code=500, detail="Research agent not initialized")
+    
+    session_id = request.session_id or f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    start_time = datetime.now()
+    
+    logger.info(LOG_SEPARATOR)
+    logger.info("NEW STREAMING RESEARCH QUERY | SESSION: %s", session_id)
+    logger.info("QUERY: %s", request.query[:LOGGED_QUERY_LENGTH])
+    logger.info(LOG_SEPARATOR)
+    
+    async def event_gen():
+        tools_used = []
+        answer_length = 0
+        # Model runs that streamed at least one token
+        streamed_runs = set()
+        
+        try:
+            initial_state = create_initial_state(request.query)
+            
+            async for event in research_agent.astream_events(initial_state, version="v2"):
+                kind = event["event"]
+                
+                if kind == "on_chat_model_stream":
+                    delta = event["data"]["chunk"].content
+                    if delta and isinstance(delta, str):
+                        streamed_runs.add(event["run_id"])
+                        answer_length += len(delta)
+                        yield format_sse({"type": "token", "delta": delta})
+                
+                elif kind == "on_chat_model_end" and event["run_id"] not in streamed_runs:
+                    # LLM cache hits return the whole message without stream events, so send it in one piece
+                    output = event["data"].get("output")
+                    text = message_text(output) if output is not None else ""
+                    if text and not getattr(output, "tool_calls", None):
+                        answer_length += len(text)
+                        yield format_sse({"type": "token", "delta": text})
+                
+                elif kind == "on_tool_start":
+                    if event["name"] not in tools_used:
+                        tools_used.append(event["name"])
+                    yield format_sse({"type": "tool_start", "tool": event["name"]})
+                
+                elif kind == "on_tool_end":
+                    yield format_sse({"type": "tool_end", "tool": event["name"]})
+            
+            processing_time = (datetime.now() - start_time).total_seconds()
+            
+            logger.info("STREAMING RESEARCH COMPLETED | SESSION: %s", session_id)
+            logger.info("TOOLS USED: %s", ', '.join(tools_used))
+            logger.info("PROCESSING TIME: %.2fs", processing_time)
+            logger.info("ANSWER LENGTH: %d chars", answer_length)
+            logger.info(LOG_SEPARATOR)
+            
+            update_analytics(request.query, tools_used, processing_time, session_id)
+            
+            yield format_sse({
+                "type": "done",
+                "session_id": session_id,
+                "tools_used": tools_used,
+                "processing_time": processing_time
+            })
+            
+        except Exception as e:
+            logger.error("STREAMING RESEARCH FAILED | SESSION: %s | ERROR: %s", session_id, e)
+            logger.info(LOG_SEPARATOR)
+            yield format_sse({"type": "error", "detail": f"Research failed: {str(e)}"})
+    
+    return StreamingResponse(event_gen(), media_type="text/event-stream")
+
 @app.get("/api/logs")
 async def get_logs(lines: int = 100):
     """Get recent log entries"""
-    log_file = Path("agent.log")
-    
-    if not log_file.exists():
-        return {"logs": [], "total_lines": 0}
+    logs = ring_handler.recent(lines)
     
-    try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            all_lines = f.readlines()
-        
-        # Get last N lines
-        recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-        
-        # Parse log entries
-        logs = []
-        for line in recent_lines:
-            line = line.strip()
-            if line:
-                # Try to parse timestamp and level
-                parts = line.split(' - ', 2)
-                if len(parts) >= 3:
-                    timestamp = parts[0]
-                    level_and_logger = parts[1]
-                    message = parts[2]
-                    
-                    # Extract level
-                    level = "INFO"
-                    if " - " in level_and_logger:
-                        level = level_and_logger.split(" - ")[-1]
-                    
-                    logs.append({
-                        "timestamp": timestamp,
-                        "level": level,
-                        "message": message
-                    })
-                else:
-                    # Fallback for malformed lines
-                    logs.append({
-                        "timestamp": datetime.now().isoformat(),
-                        "level": "INFO",
-                        "message": line
-                    })
-        
-        return {
-            "logs": logs,
-            "total_lines": len(all_lines),
-            "requested_lines": lines,
-            "returned_lines": len(logs)
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to read logs: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to read logs: {str(e)}")
+    return {
+        "logs": logs,
+        "total_lines": len(ring_handler.buffer),
+        "requested_lines": lines,
+        "returned_lines": len(logs)
+    }
 
 @app.get("/api/analytics", response_model=AnalyticsResponse)
 async def get_analytics():
     """Get system analytics and statistics"""
-    global query_analytics
-    
-    # Calculate average processing time
-    avg_time = 0
-    if query_analytics["processing_times"]:
-        avg_time = sum(query_analytics["processing_times"]) / len(query_analytics["processing_times"])
+    # Snapshot under the lock so background updates can't race the response
+    with analytics_lock:
+        total_queries = query_analytics["total_queries"]
+        tools_usage = dict(query_analytics["tools_usage"])
+        recent_queries = list(query_analytics["recent_queries"])
+        
+        # Average from the running sum, O(1) regardless of traffic
+        time_count = len(query_analytics["processing_times"])
+        avg_time = query_analytics["processing_time_sum"] / time_count if time_count else 0.0
     
     # Calculate uptime
     uptime_delta = datetime.now() - query_analytics["start_time"]
@@ -338,14 +459,17 @@ async def get_analytics():
     log_size = log_file.stat().st_size if log_file.exists() else 0
     
     return AnalyticsResponse(
-        total_queries=query_analytics["total_queries"],
-        tools_usage=query_analytics["tools_usage"],
+        total_queries=total_queries,
+        tools_usage=tools_usage,
         average_processing_time=avg_time,
-        recent_queries=query_analytics["recent_queries"],
+        recent_queries=recent_queries,
         log_file_size=log_size,
         uptime=uptime_str
     )
 
+# Chunk size for streaming the log file download
+LOG_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 @app.get("/api/download-logs")
 async def download_logs():
     """Download the complete log file"""
@@ -354,10 +478,28 @@ async def download_logs():
     if not log_file.exists():
         raise HTTPException(status_code=404, detail="Log file not found")
     
-    return FileResponse(
-        path=str(log_file),
-        filename=f"research_agent_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
-        media_type='text/plain'
+    # The log keeps growing while it is downloaded, so send exactly the bytes that
+    # existed when the request arrived to match the declared Content-Length
+    file_size = log_file.stat().st_size
+    
+    async def file_chunks():
+        remaining = file_size
+        async with await anyio.open_file(log_file, 'rb') as f:
+            while remaining > 0:
+                chunk = await f.read(min(LOG_DOWNLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+    
+    filename = f"research_agent_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    return StreamingResponse(
+        file_chunks(),
+        media_type='text/plain',
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(file_size)
+        }
     )
 
 @app.delete("/api/clear-logs")
@@ -371,15 +513,26 @@ async def clear_logs():
             backup_name = f"agent_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
             backup_path = log_file.parent / backup_name
             
-            # Copy to backup
-            import shutil
-            shutil.copy2(log_file, backup_path)
+            # Rotate by rename instead of copying the whole file. Holding the
+            # handler lock keeps the log listener from writing mid-swap.
+            file_handler.acquire()
+            try:
+                if file_handler.stream:
+                    file_handler.stream.close()
+                    # A None stream makes FileHandler.emit reopen the file lazily if the reopen below fails
+                    file_handler.stream = None
+                try:
+                    os.replace(log_file, backup_path)
+                finally:
+                    # Reopen even if the rename failed so later records still reach the log file
+                    file_handler.stream = open(file_handler.baseFilename, 'a', encoding='utf-8')
+                file_handler.stream.write(f"# Log cleared at {datetime.now()}\n")
+            finally:
+                file_handler.release()
             
-            # Clear the main log file
-            with open(log_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Log cleared at {datetime.now()}\n")
+            ring_handler.clear()
             
-            logger.info(f"Log file cleared. Backup saved as: {backup_name}")
+            logger.info("Log file cleared. Backup saved as: %s", backup_name)
             
             return {
                 "success": True,
@@ -393,7 +546,7 @@ async def clear_logs():
             }
             
     except Exception as e:
-        logger.error(f"Failed to clear logs: {e}")
+        logger.error("Failed to clear logs: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to clear logs: {str(e)}")
 
 @app.get("/")
@@ -405,18 +558,14 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
-    # Additional logging configuration to suppress reload messages
-    logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
-    logging.getLogger("watchfiles.main").setLevel(logging.WARNING)
-    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8001,
         reload=True,
-        log_level="info",
+        log_level="warning",  # uvicorn re-applies its own logger levels at startup
         access_log=False,  # Disable access logs
-        reload_excludes=["*.log", "*.tmp", "__pycache__", "*.pyc"],  # Exclude more file types
-        reload_dirs=["./"],  # Only watch current directory
+        reload_excludes=["*.log", "*.tmp", "*.db", "__pycache__", "*.pyc"],  # Exclude logs, caches and bytecode
+        reload_dirs=[str(Path(__file__).parent)],  # Only watch the backend source directory
         use_colors=False  # Disable colors in logs
     )
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Research Agent - Semantic Cache
+Embedding-similarity cache so paraphrased queries reuse earlier results
+"""
+import logging
+import re
+import threading
+import time
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Small local embedder (384-d), fast enough to run on CPU per request
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Numbers and capitalized words (years, amounts, names) that must match for a cache hit
+QUERY_DETAIL_PATTERN = re.compile(r"\d+(?:[.,]\d+)*|\b[A-Z][\w-]*")
+
+
+def query_details(query: str) -> tuple:
+    """Numbers and likely entity names in a query, used to keep near-duplicate queries apart"""
+    # Skip the first word, which is usually capitalized only because it starts the sentence
+    _, _, rest = query.partition(" ")
+    details = set(re.findall(r"\d+(?:[.,]\d+)*", query))
+    details.update(word.lower() for word in QUERY_DETAIL_PATTERN.findall(rest))
+    return tuple(sorted(details))
+
+
+@lru_cache(maxsize=1)
+def get_embedder():
+    """
+    Load the sentence embedding model once per process
+
+    Returns:
+        SentenceTransformer instance, or None if it cannot be loaded
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        logger.warning("Semantic cache disabled: could not load %s: %s", EMBEDDING_MODEL, e)
+        return None
+
+
+class SemanticCache:
+    """
+    In-memory cache keyed by normalized query embeddings
+
+    Embeddings are kept in a single float32 matrix of shape (N, d) so a lookup
+    is one matrix-vector product followed by an argmax.
+    """
+
+    def __init__(self, threshold: float = 0.90, ttl_seconds: float = 3600, max_entries: int = 1000):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._embeddings: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._tags: List[Any] = []
+        self._expires_at: List[float] = []
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Return the normalized embedding for text, or None if no embedder is available"""
+        embedder = get_embedder()
+        if embedder is None:
+            return None
+        return embedder.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, embedding: np.ndarray, tag: Any = None) -> Optional[Any]:
+        """
+        Return the cached value most similar to embedding if it clears the threshold
+
+        Only entries stored with an equal tag are candidates, so callers can keep
+        near-identical texts that differ in an important detail apart.
+        """
+        with self._lock:
+            self._evict_expired()
+            if not self._values:
+                return None
+
+            sims = self._embeddings @ embedding
+            if tag is not None or any(t is not None for t in self._tags):
+                mask = np.fromiter((t == tag for t in self._tags), dtype=bool, count=len(self._tags))
+                sims = np.where(mask, sims, -np.inf)
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+
+            logger.info("SEMANTIC CACHE HIT | similarity=%.3f", sims[best])
+            return self._values[best]
+
+    def store(self, embedding: np.ndarray, value: Any, tag: Any = None):
+        """Add a value under embedding (and an optional tag), evicting the oldest entry when full"""
+        with self._lock:
+            self._evict_expired()
+            if len(self._values) >= self.max_entries:
+                self._drop_oldest(len(self._values) - self.max_entries + 1)
+
+            row = embedding.reshape(1, -1)
+            self._embeddings = row if self._embeddings is None else np.vstack([self._embeddings, row])
+            self._values.append(value)
+            self._tags.append(tag)
+            self._expires_at.append(time.monotonic() + self.ttl_seconds)
+
+    def _evict_expired(self):
+        # Entries share one TTL and are appended in time order, so expired ones form a prefix
+        now = time.monotonic()
+        expired = 0
+        while expired < len(self._expires_at) and self._expires_at[expired] <= now:
+            expired += 1
+        if expired:
+            self._drop_oldest(expired)
+
+    def _drop_oldest(self, count: int):
+        self._embeddings = self._embeddings[count:] if count < len(self._values) else None
+        del self._values[:count]
+        del self._tags[:count]
+        del self._expires_at[:count]
+
+
+def semantic_cached(
+    namespace: str,
+    threshold: float = 0.92,
+    ttl_hours: float = 24,
+    max_entries: int = 1000,
+    should_cache: Optional[Callable[[Any], bool]] = None
+):
+    """
+    Memoize a single-query function by query similarity
+
+    A call whose query embeds within threshold cosine similarity of an earlier one
+    reuses that result, provided both queries mention the same numbers and names
+    (see query_details), since the embedder scores "2023" and "2024" variants as
+    near-duplicates. Without an embedder this falls back to exact-match lookups.
+    Only returned values are stored; if the function raises, or should_cache
+    rejects the result, nothing is cached.
+
+    Args:
+        namespace: Cache namespace, usually the tool name
+        threshold: Minimum cosine similarity for a hit
+        ttl_hours: How long a cached result stays valid
+        max_entries: Most results kept before the oldest are evicted
+        should_cache: Decides whether a result is stored (default: store everything)
+    """
+    def decorator(func):
+        cache = SemanticCache(threshold=threshold, ttl_seconds=ttl_hours * 3600, max_entries=max_entries)
+        exact: Dict[str, Tuple[float, Any]] = {}
+        exact_lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(query: str):
+            embedding = cache.embed(query)
+
+            if embedding is None:
+                with exact_lock:
+                    entry = exact.get(query)
+                    if entry is not None and entry[0] > time.monotonic():
+                        logger.info("EXACT CACHE HIT | %s", namespace)
+                        return entry[1]
+
+                result = func(query)
+                if should_cache is not None and not should_cache(result):
+                    return result
+                with exact_lock:
+                    exact.pop(query, None)
+                    if len(exact) >= max_entries:
+                        # Dicts keep insertion order, so the first key is the oldest
+                        del exact[next(iter(exact))]
+                    exact[query] = (time.monotonic() + cache.ttl_seconds, result)
+                return result
+
+            tag = query_details(query)
+            cached = cache.lookup(embedding, tag=tag)
+            if cached is not None:
+                logger.info("SEMANTIC CACHE HIT | %s", namespace)
+                return cached
+
+            result = func(query)
+            if should_cache is None or should_cache(result):
+                cache.store(embedding, result, tag=tag)
+            return result
+
+        return wrapper
+
+    return decorator
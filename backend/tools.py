@@ -1,19 +1,33 @@
 # Research Agent - Tool Registry
 # This module manages all search tools available to the agent
 
+import gc
+import io
 import os
+import asyncio
+import re
+import time
+import atexit
+import socket
+import hashlib
 import logging
-from tavily import TavilyClient
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Optional
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain_core.tools import tool
-from langchain_community.document_loaders import UnstructuredURLLoader
-from langchain_community.document_loaders import WikipediaLoader
-from langchain_community.document_loaders import YoutubeLoader
-from langchain_community.document_loaders import ArxivLoader
-from langchain_community.document_loaders import PubMedLoader
-from langchain_community.tools import DuckDuckGoSearchResults
-from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
-from langchain_pymupdf4llm import PyMuPDF4LLMLoader
 from dotenv import load_dotenv
+from disk_cache import disk_cached
+from semantic_cache import semantic_cached
+
+# Heavy SDKs and loaders are imported inside the functions that use them, so
+# importing this module (and starting the server) stays fast
 
 # Load environment variables
 load_dotenv()
@@ -26,11 +40,161 @@ logging.basicConfig(
         logging.FileHandler('agent.log', mode='a', encoding='utf-8')
     ]
 )
-logging = logging.getLogger(__name__)
+logger = logging.getLogger(__name__)
+
+# Max characters kept from each fetched web page
+URL_CONTENT_MAX_LENGTH = 3000
+
+# Results of the slow fetch tools also kept in process, in front of the disk cache
+MEMORY_CACHE_ENTRIES = 256
+
+# Worker threads for the blocking loader/SDK calls behind the async tools; the default
+# matches ThreadPoolExecutor's own sizing for I/O-bound work
+TOOL_POOL_WORKERS = int(os.getenv("TOOL_POOL_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+
+_POOL = ThreadPoolExecutor(max_workers=TOOL_POOL_WORKERS, thread_name_prefix="tool")
+atexit.register(_POOL.shutdown, wait=False)
+
+# Shared HTTP session so repeated requests to the same host reuse keep-alive connections.
+# Every pool thread may hold a connection, so each host's pool is sized to match.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers["User-Agent"] = "research-agent/1.0"
+_http_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=TOOL_POOL_WORKERS,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+HTTP_SESSION.mount("https://", _http_adapter)
+HTTP_SESSION.mount("http://", _http_adapter)
+
+# asyncio.wait_for can't stop a worker thread, so the calls inside it need their own limits.
+# Entrez, the arXiv feed, Wikipedia and the transcript API take no timeout argument, so only
+# their calls run under this socket default.
+TOOL_SOCKET_TIMEOUT = 20
+_socket_timeout_lock = threading.Lock()
+_socket_timeout_users = 0
+_socket_timeout_saved = None
+
+
+@contextmanager
+def _default_socket_timeout():
+    """
+    Apply TOOL_SOCKET_TIMEOUT as the socket default while the block runs
+    
+    The default is process-wide, so overlapping callers share one override and
+    the previous value comes back when the last of them leaves.
+    """
+    global _socket_timeout_users, _socket_timeout_saved
+    with _socket_timeout_lock:
+        if _socket_timeout_users == 0:
+            _socket_timeout_saved = socket.getdefaulttimeout()
+            socket.setdefaulttimeout(TOOL_SOCKET_TIMEOUT)
+        _socket_timeout_users += 1
+    try:
+        yield
+    finally:
+        with _socket_timeout_lock:
+            _socket_timeout_users -= 1
+            if _socket_timeout_users == 0:
+                socket.setdefaulttimeout(_socket_timeout_saved)
+
+
+def _download_to_file(url: str, path: str, max_bytes: int, source: str):
+    """Stream a URL into a local file through the shared session, refusing files over max_bytes"""
+    with HTTP_SESSION.get(url, stream=True, timeout=10) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"Could not download file from {source}. Status code: {response.status_code}")
+        
+        if int(response.headers.get("Content-Length", 0)) > max_bytes:
+            raise RuntimeError(f"File at {source} is larger than {max_bytes} bytes")
+        
+        # iter_content undoes any gzip encoding; count bytes in case Content-Length is missing
+        downloaded = 0
+        with open(path, 'wb') as out:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                downloaded += len(chunk)
+                if downloaded > max_bytes:
+                    raise RuntimeError(f"File at {source} is larger than {max_bytes} bytes")
+                out.write(chunk)
+
+
+async def _run_blocking(func, *args):
+    """Run a blocking function on the tool thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, func, *args)
+
+
+@lru_cache(maxsize=1)
+def _tavily_client():
+    """Shared Tavily client, or None if TAVILY_API_KEY is not set"""
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        return None
+    from tavily import TavilyClient
+    return TavilyClient(api_key=api_key)
+
+
+@lru_cache(maxsize=1)
+def _cerebras_client():
+    """Shared Cerebras client, or None if CEREBRAS_API_KEY is not set"""
+    api_key = os.getenv("CEREBRAS_API_KEY")
+    if not api_key:
+        return None
+    # Import Cerebras (only when needed)
+    from cerebras.cloud.sdk import Cerebras
+    return Cerebras(api_key=api_key)
+
+
+class _UncachedText(str):
+    """Tool output reporting a setup problem, an empty search or a failed fetch; the caches never store it"""
+
+
+def _cacheable(result) -> bool:
+    """should_cache predicate that rejects _UncachedText results"""
+    return not isinstance(result, _UncachedText)
+
+
+@semantic_cached("tavily_search", should_cache=_cacheable)
+def _tavily_search_impl(query: str) -> str:
+    """Run a Tavily search and format the top 3 URLs by relevance score"""
+    client = _tavily_client()
+    
+    if client is None:
+        result = _UncachedText("Error: TAVILY_API_KEY environment variable is not set")
+        logger.info("TOOL: tavily_search | OUTPUT: %s", result)
+        return result
+    
+    response = client.search(query=query, max_results=10)
+    
+    results = response.get("results", [])
+    
+    if not results:
+        result = _UncachedText("No results found.")
+        logger.info("TOOL: tavily_search | OUTPUT: %s", result)
+        return result
+    
+    # Sort by score and get top 3
+    sorted_results = sorted(results, key=lambda x: x.get('score', 0), reverse=True)
+    top_3 = sorted_results[:3]
+    
+    # Format only title and URL for top 3
+    formatted = []
+    for i, res in enumerate(top_3, 1):
+        formatted.append(
+            f"{i}. {res.get('title', 'No title')}\n"
+            f"   URL: {res.get('url', 'No URL')}\n"
+            f"   Score: {res.get('score', 'N/A')}"
+        )
+    
+    result = "\n\n".join(formatted)
+    result += "\n\nUse fetch_urls_content tool to read the full content from these URLs in one call."
+    
+    logger.info("TOOL: tavily_search | OUTPUT: Top 3 URLs from %s results", len(results))
+    return result
 
 
 @tool
-def tavily_search(query: str) -> str:
+async def tavily_search(query: str) -> str:
     """
     Search the internet using Tavily API to find relevant URLs.
     Returns top 3 URLs by relevance score. Use fetch_url_content to read the full content from these URLs.
@@ -41,53 +205,95 @@ def tavily_search(query: str) -> str:
     Returns:
         str: Top 3 URLs with titles and scores
     """
-    logging.info(f"TOOL: tavily_search | INPUT: {query}")
-    
-    api_key = os.getenv("TAVILY_API_KEY")
-    
-    if not api_key:
-        result = "Error: TAVILY_API_KEY environment variable is not set"
-        logging.info(f"TOOL: tavily_search | OUTPUT: {result}")
-        return result
+    logger.info("TOOL: tavily_search | INPUT: %s", query)
     
     try:
-        client = TavilyClient(api_key=api_key)
-        response = client.search(query=query, max_results=10)
-        
-        results = response.get("results", [])
-        
-        if not results:
-            result = "No results found."
-            logging.info(f"TOOL: tavily_search | OUTPUT: {result}")
-            return result
-        
-        # Sort by score and get top 3
-        sorted_results = sorted(results, key=lambda x: x.get('score', 0), reverse=True)
-        top_3 = sorted_results[:3]
-        
-        # Format only title and URL for top 3
-        formatted = []
-        for i, res in enumerate(top_3, 1):
-            formatted.append(
-                f"{i}. {res.get('title', 'No title')}\n"
-                f"   URL: {res.get('url', 'No URL')}\n"
-                f"   Score: {res.get('score', 'N/A')}"
-            )
-        
-        result = "\n\n".join(formatted)
-        result += "\n\nUse fetch_url_content tool to read the full content from these URLs."
-        
-        logging.info(f"TOOL: tavily_search | OUTPUT: Top 3 URLs from {len(results)} results")
-        return result
+        return await _run_blocking(_tavily_search_impl, query)
         
     except Exception as e:
         result = f"Tavily search failed: {str(e)}"
-        logging.info(f"TOOL: tavily_search | OUTPUT: {result}")
+        logger.info("TOOL: tavily_search | OUTPUT: %s", result)
+        return result
+
+
+# New-style arXiv identifier, e.g. 2301.01234 in arxiv.org/abs/2301.01234v2
+ARXIV_ID_PATTERN = re.compile(r"(\d{4}\.\d{4,5})")
+
+# youtube.com/shorts/<id> and youtube.com/embed/<id> video paths
+YOUTUBE_VIDEO_PATH = re.compile(r"^/(?:shorts|embed)/[\w-]+")
+
+
+def _is_youtube_video(parsed) -> bool:
+    """True for URLs of a single YouTube video (not channels, playlists or search pages)"""
+    host = parsed.netloc.lower().split(":")[0]
+    if host == "youtu.be":
+        return bool(parsed.path.strip("/"))
+    if host == "youtube.com" or host.endswith(".youtube.com"):
+        if parsed.path == "/watch":
+            return bool(parse_qs(parsed.query).get("v"))
+        return bool(YOUTUBE_VIDEO_PATH.match(parsed.path))
+    return False
+
+
+def _normalize_url(url: str) -> str:
+    """
+    Cache key for a URL: lowercase scheme and host, sorted query, no fragment
+    
+    Only used as a key; the original URL is what gets fetched, since re-encoding
+    can break signed or case-sensitive query strings.
+    """
+    parsed = urlparse(url.strip())
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path, parsed.params, query, ""))
+
+
+@disk_cached("fetch_url_content", key=_normalize_url, should_cache=_cacheable, memory_entries=MEMORY_CACHE_ENTRIES)
+def _fetch_url_content_impl(url: str) -> str:
+    """Download a web page and return its formatted text content"""
+    # Hand URLs that a dedicated tool parses better straight to that tool
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    
+    if "arxiv.org" in host:
+        match = ARXIV_ID_PATTERN.search(parsed.path)
+        if match:
+            logger.info("TOOL: fetch_url_content | ROUTE: arxiv_search (%s)", match.group(1))
+            return _arxiv_search_impl(match.group(1))
+    
+    if _is_youtube_video(parsed):
+        logger.info("TOOL: fetch_url_content | ROUTE: youtube_transcript")
+        return _youtube_transcript_impl(url)
+    
+    if parsed.path.lower().endswith(".pdf"):
+        logger.info("TOOL: fetch_url_content | ROUTE: pdf_extract")
+        return _pdf_extract_impl(url)
+    
+    # Stream so a PDF served without a .pdf path can be handed off before its body is read
+    with HTTP_SESSION.get(url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        html = response.text if content_type != "application/pdf" else None
+    
+    if html is None:
+        logger.info("TOOL: fetch_url_content | ROUTE: pdf_extract")
+        return _pdf_extract_impl(url)
+    
+    content = _html_to_text(html)
+    
+    if not content:
+        result = _UncachedText(f"No content found at {url}")
+        logger.info("TOOL: fetch_url_content | OUTPUT: %s", result)
         return result
+    
+    content = _truncate_content(content)
+    
+    result = f"Content from {url}:\n\n{content}"
+    logger.info("TOOL: fetch_url_content | OUTPUT: Fetched %s chars", len(content))
+    return result
 
 
 @tool
-def fetch_url_content(url: str) -> str:
+async def fetch_url_content(url: str) -> str:
     """
     Fetch and parse the full content from a web page URL.
     Use this when you need to read detailed information from a specific webpage.
@@ -98,36 +304,119 @@ def fetch_url_content(url: str) -> str:
     Returns:
         str: The parsed text content from the webpage
     """
-    logging.info(f"TOOL: fetch_url_content | INPUT: {url}")
+    logger.info("TOOL: fetch_url_content | INPUT: %s", url)
     
     try:
-        loader = UnstructuredURLLoader(urls=[url])
-        docs = loader.load()
-        
-        if not docs:
-            result = f"No content found at {url}"
-            logging.info(f"TOOL: fetch_url_content | OUTPUT: {result}")
-            return result
-        
-        content = docs[0].page_content
-        
-        # Limit content length to avoid token limits
-        max_length = 3000
-        if len(content) > max_length:
-            content = content[:max_length] + "...\n[Content truncated]"
-        
-        result = f"Content from {url}:\n\n{content}"
-        logging.info(f"TOOL: fetch_url_content | OUTPUT: Fetched {len(content)} chars")
-        return result
+        return await _run_blocking(_fetch_url_content_impl, url)
         
     except Exception as e:
         result = f"Failed to fetch content from {url}: {str(e)}"
-        logging.info(f"TOOL: fetch_url_content | OUTPUT: {result}")
+        logger.info("TOOL: fetch_url_content | OUTPUT: %s", result)
         return result
 
 
+def _truncate_content(content: str) -> str:
+    """Limit page content length to avoid token limits"""
+    if len(content) > URL_CONTENT_MAX_LENGTH:
+        content = content[:URL_CONTENT_MAX_LENGTH] + "...\n[Content truncated]"
+    return content
+
+
+def _html_to_text(html: str) -> str:
+    """Extract the readable text from an HTML document"""
+    import trafilatura
+    
+    # Main article text, without navigation, comments and other boilerplate
+    content = trafilatura.extract(html, include_comments=False, include_tables=False)
+    if content:
+        return content
+    
+    # Fall back to all body text for pages without a recognizable main article
+    from selectolax.parser import HTMLParser
+    
+    body = HTMLParser(html).body
+    return body.text(separator=" ", strip=True) if body else ""
+
+
 @tool
-def wikipedia_search(query: str) -> str:
+async def fetch_urls_content(urls: List[str]) -> str:
+    """
+    Fetch and parse the full content from several web page URLs at once.
+    Use this to read the top results of a search in one call instead of calling fetch_url_content repeatedly.
+    
+    Args:
+        urls: List of web page URLs to fetch content from
+        
+    Returns:
+        str: The parsed text content from each webpage
+    """
+    logger.info("TOOL: fetch_urls_content | INPUT: %s", urls)
+    
+    # Drop URLs that normalize to one already listed, keeping the first spelling and the original order
+    unique = {}
+    for url in urls:
+        unique.setdefault(_normalize_url(url), url)
+    urls = list(unique.values())
+    if not urls:
+        result = "No URLs provided"
+        logger.info("TOOL: fetch_urls_content | OUTPUT: %s", result)
+        return result
+    
+    # Same fetch as fetch_url_content (session, retries, caches and routing), run concurrently
+    results = await asyncio.gather(
+        *(_run_blocking(_fetch_url_content_impl, url) for url in urls),
+        return_exceptions=True
+    )
+    
+    parts = []
+    failed = 0
+    for url, content in zip(urls, results):
+        if isinstance(content, Exception):
+            failed += 1
+            parts.append(f"Failed to fetch content from {url}: {str(content)}")
+        else:
+            parts.append(content)
+    
+    result = f"\n\n{'='*50}\n\n".join(parts)
+    
+    logger.info("TOOL: fetch_urls_content | OUTPUT: Fetched %s of %s URLs", len(urls) - failed, len(urls))
+    return result
+
+
+@semantic_cached("wikipedia_search", should_cache=_cacheable)
+@disk_cached("wikipedia_search", should_cache=_cacheable)
+def _wikipedia_search_impl(query: str) -> str:
+    """Load the top Wikipedia articles for a query and format them"""
+    from langchain_community.document_loaders import WikipediaLoader
+    
+    # Load Wikipedia documents
+    loader = WikipediaLoader(
+        query=query,
+        load_max_docs=2,  # Load top 2 articles
+        doc_content_chars_max=4000  # Max 4000 chars per article
+    )
+    
+    with _default_socket_timeout():
+        docs = loader.load()
+    
+    if not docs:
+        return _UncachedText(f"No Wikipedia articles found for query: {query}")
+    
+    # Format the results
+    result_parts = []
+    for i, doc in enumerate(docs, 1):
+        result_parts.append(f"--- Article {i}: {doc.metadata.get('title', 'Unknown')} ---")
+        result_parts.append(f"Source: {doc.metadata.get('source', 'N/A')}")
+        result_parts.append(f"\nContent:\n{doc.page_content}\n")
+    
+    result = "\n".join(result_parts)
+    
+    logger.info("TOOL: wikipedia_search | OUTPUT: Found %s articles, total length: %s chars", len(docs), len(result))
+    return result
+
+
+@tool
+async def wikipedia_search(query: str) -> str:
     """
     Search Wikipedia for comprehensive, reliable general knowledge on any topic.
     
@@ -140,42 +429,59 @@ def wikipedia_search(query: str) -> str:
     Returns:
         str: Wikipedia article content with title, summary, and source URL
     """
-    logging.info(f"TOOL: wikipedia_search | INPUT: {query}")
+    logger.info("TOOL: wikipedia_search | INPUT: %s", query)
     
     try:
-        # Load Wikipedia documents
-        loader = WikipediaLoader(
-            query=query,
-            load_max_docs=2,  # Load top 2 articles
-            doc_content_chars_max=4000,  # Max 4000 chars per article
-            load_all_available_meta=True  # Get all metadata
-        )
-        
-        docs = loader.load()
-        
-        if not docs:
-            return f"No Wikipedia articles found for query: {query}"
-        
-        # Format the results
-        result_parts = []
-        for i, doc in enumerate(docs, 1):
-            result_parts.append(f"--- Article {i}: {doc.metadata.get('title', 'Unknown')} ---")
-            result_parts.append(f"Source: {doc.metadata.get('source', 'N/A')}")
-            result_parts.append(f"\nContent:\n{doc.page_content}\n")
-        
-        result = "\n".join(result_parts)
-        
-        logging.info(f"TOOL: wikipedia_search | OUTPUT: Found {len(docs)} articles, total length: {len(result)} chars")
-        return result
+        return await _run_blocking(_wikipedia_search_impl, query)
         
     except Exception as e:
         error_msg = f"Error searching Wikipedia: {str(e)}"
-        logging.error(f"TOOL: wikipedia_search | ERROR: {error_msg}")
+        logger.error("TOOL: wikipedia_search | ERROR: %s", error_msg)
         return error_msg
 
 
+@disk_cached("arxiv_search", should_cache=_cacheable)
+def _arxiv_search_impl(query: str) -> str:
+    """Fetch arXiv paper summaries for a query (or arXiv ID) and format them"""
+    from langchain_community.document_loaders import ArxivLoader
+    
+    # Initialize ArxivLoader
+    loader = ArxivLoader(
+        query=query,
+        load_max_docs=3  # Load top 3 papers
+    )
+    
+    # Get summaries as documents (faster, no full PDF download)
+    with _default_socket_timeout():
+        docs = loader.get_summaries_as_docs()
+    
+    if not docs:
+        return _UncachedText(f"No arXiv papers found for query: {query}")
+    
+    # Format the results
+    buf = io.StringIO()
+    for i, doc in enumerate(docs, 1):
+        metadata = doc.metadata
+        if i > 1:
+            buf.write("\n")
+        buf.write(
+            f"\n--- Paper {i} ---\n"
+            f"Title: {metadata.get('Title', 'N/A')}\n"
+            f"Authors: {metadata.get('Authors', 'N/A')}\n"
+            f"Published: {metadata.get('Published', 'N/A')}\n"
+            f"Entry ID: {metadata.get('Entry ID', 'N/A')}\n"
+            f"\nAbstract:\n{doc.page_content}\n"
+            f"\n{'='*50}"
+        )
+    
+    result = buf.getvalue()
+    
+    logger.info("TOOL: arxiv_search | OUTPUT: Found %s papers", len(docs))
+    return result
+
+
 @tool
-def arxiv_search(query: str) -> str:
+async def arxiv_search(query: str) -> str:
     """
     Search arXiv for academic research papers and scientific publications.
     
@@ -188,46 +494,55 @@ def arxiv_search(query: str) -> str:
     Returns:
         str: Research paper details including titles, authors, summaries, and publication info
     """
-    logging.info(f"TOOL: arxiv_search | INPUT: {query}")
+    logger.info("TOOL: arxiv_search | INPUT: %s", query)
     
     try:
-        # Initialize ArxivLoader
-        loader = ArxivLoader(
-            query=query,
-            load_max_docs=3  # Load top 3 papers
-        )
-        
-        # Get summaries as documents (faster, no full PDF download)
-        docs = loader.get_summaries_as_docs()
-        
-        if not docs:
-            return f"No arXiv papers found for query: {query}"
-        
-        # Format the results
-        result_parts = []
-        for i, doc in enumerate(docs, 1):
-            metadata = doc.metadata
-            result_parts.append(f"\n--- Paper {i} ---")
-            result_parts.append(f"Title: {metadata.get('Title', 'N/A')}")
-            result_parts.append(f"Authors: {metadata.get('Authors', 'N/A')}")
-            result_parts.append(f"Published: {metadata.get('Published', 'N/A')}")
-            result_parts.append(f"Entry ID: {metadata.get('Entry ID', 'N/A')}")
-            result_parts.append(f"\nAbstract:\n{doc.page_content}")
-            result_parts.append("\n" + "="*50)
-        
-        result = "\n".join(result_parts)
-        
-        logging.info(f"TOOL: arxiv_search | OUTPUT: Found {len(docs)} papers")
-        return result
+        return await _run_blocking(_arxiv_search_impl, query)
         
     except Exception as e:
         error_msg = f"Error searching arXiv: {str(e)}"
-        logging.error(f"TOOL: arxiv_search | ERROR: {error_msg}")
+        logger.error("TOOL: arxiv_search | ERROR: %s", error_msg)
         return error_msg
 
 
+@disk_cached("youtube_transcript", should_cache=_cacheable, memory_entries=MEMORY_CACHE_ENTRIES)
+def _youtube_transcript_impl(video_url: str) -> str:
+    """Load a YouTube video's transcript and format it"""
+    from langchain_community.document_loaders import YoutubeLoader
+    
+    # Initialize YoutubeLoader with video info
+    loader = YoutubeLoader.from_youtube_url(
+        video_url,
+        add_video_info=True,
+        language=["en", "hi"]  # Support English and Hindi
+    )
+    
+    # Load the document
+    with _default_socket_timeout():
+        docs = loader.load()
+    
+    if not docs:
+        return _UncachedText(f"Could not load transcript from: {video_url}. Video may not have captions available.")
+    
+    # Get the document
+    doc = docs[0]
+    
+    # Format the result
+    result_parts = [
+        f"=== YouTube Video Transcript ===",
+        f"URL: {video_url}",
+        f"\nTranscript:\n",
+        doc.page_content
+    ]
+    
+    result = "\n".join(result_parts)
+    
+    logger.info("TOOL: youtube_transcript | OUTPUT: Loaded transcript (length: %s chars)", len(doc.page_content))
+    return result
+
+
 @tool
-def youtube_transcript(video_url: str) -> str:
+async def youtube_transcript(video_url: str) -> str:
     """
     Extract transcript and information from a YouTube video.
     
@@ -240,46 +555,100 @@ def youtube_transcript(video_url: str) -> str:
     Returns:
         str: Video transcript with title and basic information
     """
-    logging.info(f"TOOL: youtube_transcript | INPUT: {video_url}")
+    logger.info("TOOL: youtube_transcript | INPUT: %s", video_url)
     
     try:
-        # Initialize YoutubeLoader with video info
-        loader = YoutubeLoader.from_youtube_url(
-            video_url,
-            add_video_info=True,
-            language=["en", "hi"]  # Support English and Hindi
-        )
-        
-        # Load the document
-        docs = loader.load()
-        
-        if not docs:
-            return f"Could not load transcript from: {video_url}. Video may not have captions available."
-        
-        # Get the document
-        doc = docs[0]
-        
-        # Format the result
-        result_parts = [
-            f"=== YouTube Video Transcript ===",
-            f"URL: {video_url}",
-            f"\nTranscript:\n",
-            doc.page_content
-        ]
-        
-        result = "\n".join(result_parts)
-        
-        logging.info(f"TOOL: youtube_transcript | OUTPUT: Loaded transcript (length: {len(doc.page_content)} chars)")
-        return result
+        return await _run_blocking(_youtube_transcript_impl, video_url)
         
     except Exception as e:
         error_msg = f"Error loading YouTube transcript: {str(e)}. Make sure the video has captions/subtitles available."
-        logging.error(f"TOOL: youtube_transcript | ERROR: {error_msg}")
+        logger.error("TOOL: youtube_transcript | ERROR: %s", error_msg)
         return error_msg
 
 
+# NCBI asks E-utilities clients to identify themselves with a contact email
+ENTREZ_EMAIL = os.getenv("ENTREZ_EMAIL", "research-agent@example.com")
+
+
+def _entrez_read(handle):
+    """Parse an Entrez response and close its handle"""
+    from Bio import Entrez
+    try:
+        return Entrez.read(handle)
+    finally:
+        handle.close()
+
+
+def _pubmed_pub_date(article) -> str:
+    """Format a PubMed article's journal issue date (e.g. 2023-Apr-05)"""
+    pub_date = article.get("Journal", {}).get("JournalIssue", {}).get("PubDate", {})
+    if "MedlineDate" in pub_date:
+        return str(pub_date["MedlineDate"])
+    parts = [str(pub_date[field]) for field in ("Year", "Month", "Day") if field in pub_date]
+    return "-".join(parts) or "N/A"
+
+
+def _pubmed_author_name(author) -> str:
+    """Format one PubMed AuthorList entry"""
+    if "CollectiveName" in author:
+        return str(author["CollectiveName"])
+    return " ".join(str(author[field]) for field in ("ForeName", "LastName") if field in author)
+
+
+def _pubmed_search_impl(query: str, max_results: int = 3) -> str:
+    """Search PubMed and format the matching articles"""
+    from Bio import Entrez
+    Entrez.email = ENTREZ_EMAIL
+    
+    # One esearch for the IDs, then one batched efetch for all the records
+    with _default_socket_timeout():
+        ids = _entrez_read(Entrez.esearch(db="pubmed", term=query, retmax=max_results))["IdList"]
+    
+    if not ids:
+        return f"No PubMed articles found for: {query}"
+    
+    with _default_socket_timeout():
+        records = _entrez_read(Entrez.efetch(db="pubmed", id=",".join(ids), retmode="xml"))
+    articles = records.get("PubmedArticle", [])
+    
+    if not articles:
+        return f"No PubMed articles found for: {query}"
+    
+    # Format results
+    buf = io.StringIO()
+    buf.write(
+        f"=== PubMed Search Results ===\n"
+        f"Query: {query}\n"
+        f"Found: {len(articles)} articles\n"
+    )
+    
+    for i, record in enumerate(articles, 1):
+        citation = record["MedlineCitation"]
+        article = citation["Article"]
+        buf.write(
+            f"\n\n--- Article {i} ---\n"
+            f"Title: {article.get('ArticleTitle', 'N/A')}\n"
+            f"Published: {_pubmed_pub_date(article)}\n"
+            f"PubMed ID: {citation.get('PMID', 'N/A')}"
+        )
+        
+        # Add authors if available
+        authors = [_pubmed_author_name(author) for author in article.get("AuthorList", [])[:3]]  # First 3 authors
+        if authors:
+            buf.write(f"\nAuthors: {', '.join(authors)}")
+        
+        abstract = " ".join(str(text) for text in article.get("Abstract", {}).get("AbstractText", []))
+        buf.write(f"\n\nAbstract:\n{abstract[:1000]}...")  # First 1000 chars
+        buf.write(f"\n\n{'='*50}")
+    
+    result = buf.getvalue()
+    
+    logger.info("TOOL: pubmed_search | OUTPUT: Found %s articles", len(articles))
+    return result
+
+
 @tool
-def pubmed_search(query: str, max_results: int = 3) -> str:
+async def pubmed_search(query: str, max_results: int = 3) -> str:
     """
     Search PubMed for biomedical and medical research articles.
     
@@ -293,53 +662,123 @@ def pubmed_search(query: str, max_results: int = 3) -> str:
     Returns:
         str: Research articles with titles, abstracts, authors, and publication info
     """
-    logging.info(f"TOOL: pubmed_search | INPUT: {query}, max_results={max_results}")
+    logger.info("TOOL: pubmed_search | INPUT: %s, max_results=%s", query, max_results)
     
     try:
-        # Initialize PubMed loader
-        loader = PubMedLoader(query, load_max_docs=max_results)
-        
-        # Load documents
-        docs = loader.load()
-        
-        if not docs:
-            return f"No PubMed articles found for: {query}"
-        
-        # Format results
-        result_parts = [
-            f"=== PubMed Search Results ===",
-            f"Query: {query}",
-            f"Found: {len(docs)} articles\n"
-        ]
+        return await _run_blocking(_pubmed_search_impl, query, max_results)
         
-        for i, doc in enumerate(docs, 1):
+    except Exception as e:
+        error_msg = f"Error searching PubMed: {str(e)}"
+        logger.error("TOOL: pubmed_search | ERROR: %s", error_msg)
+        return error_msg
+
+
+def _pdf_cache_key(file_path: str) -> str:
+    """Cache remote PDFs by URL and local PDFs by their content"""
+    if file_path.startswith(("http://", "https://")):
+        return file_path
+    
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Stop extracting PDF pages once this many characters have been collected
+PDF_MAX_TOTAL_CHARS = 20000
+
+# Refuse to download PDFs larger than this
+PDF_MAX_BYTES = 50_000_000
+
+
+@disk_cached("pdf_extract", key=_pdf_cache_key, should_cache=_cacheable)
+def _pdf_extract_impl(file_path: str) -> str:
+    """Extract a local or remote PDF's pages as markdown and format them"""
+    if not file_path.startswith(("http://", "https://")):
+        return _extract_pdf_file(file_path, file_path)
+    
+    # Download through the shared session (timeouts, retries, size cap) instead of the loader's own fetch
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+    try:
+        _download_to_file(file_path, tmp_path, PDF_MAX_BYTES, file_path)
+        return _extract_pdf_file(tmp_path, file_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def _extract_pdf_file(path: str, source: str) -> str:
+    """Extract a local PDF's pages as markdown, reporting it under source"""
+    from langchain_pymupdf4llm import PyMuPDF4LLMLoader
+    
+    # Initialize PyMuPDF4LLM loader
+    loader = PyMuPDF4LLMLoader(
+        path,
+        mode="page",  # Split by page for better structure
+        extract_images=False  # Skip images for speed (can enable if needed)
+    )
+    
+    buf = io.StringIO()
+    pages_read = 0
+    total_chars = 0
+    total_pages = None
+    
+    # Pages are parsed one at a time; stop once the output budget is used up
+    pages = loader.lazy_load()
+    for doc in pages:
+        if pages_read == 0:
+            # Get metadata from first document
             metadata = doc.metadata
-            result_parts.append(f"\n--- Article {i} ---")
-            result_parts.append(f"Title: {metadata.get('Title', 'N/A')}")
-            result_parts.append(f"Published: {metadata.get('Published', 'N/A')}")
-            result_parts.append(f"PubMed ID: {metadata.get('uid', 'N/A')}")
+            total_pages = metadata.get('total_pages')
             
-            # Add authors if available
-            if 'Authors' in metadata:
-                authors = metadata['Authors'][:3]  # First 3 authors
-                result_parts.append(f"Authors: {', '.join(authors)}")
-            
-            result_parts.append(f"\nAbstract:\n{doc.page_content[:1000]}...")  # First 1000 chars
-            result_parts.append(f"\n{'='*50}")
+            # Format results
+            buf.write(
+                "=== PDF Content Extraction ===\n"
+                f"Source: {source}\n"
+                f"Total Pages: {total_pages or 'N/A'}\n"
+                f"Format: {metadata.get('format', 'N/A')}\n"
+                f"Created: {metadata.get('creationdate', 'N/A')}\n"
+                f"Producer: {metadata.get('producer', 'N/A')}\n"
+                f"\n{'='*50}\n"
+            )
         
-        result = "\n".join(result_parts)
+        page_num = doc.metadata.get('page', 'Unknown')
+        buf.write(f"\n\n--- Page {page_num + 1} ---\n\n")
         
-        logging.info(f"TOOL: pubmed_search | OUTPUT: Found {len(docs)} articles")
-        return result
+        # Limit content per page to avoid token limits
+        content = doc.page_content
+        if len(content) > 2000:
+            content = content[:2000] + "...\n[Content truncated for length]"
         
-    except Exception as e:
-        error_msg = f"Error searching PubMed: {str(e)}"
-        logging.error(f"TOOL: pubmed_search | ERROR: {error_msg}")
-        return error_msg
+        buf.write(content)
+        buf.write(f"\n\n{'='*50}\n")
+        
+        pages_read += 1
+        total_chars += len(content)
+        if total_chars >= PDF_MAX_TOTAL_CHARS:
+            break
+    
+    if pages_read == 0:
+        return _UncachedText(f"Could not extract content from PDF: {source}")
+    
+    result = buf.getvalue()
+    buf.close()
+    
+    if total_pages and pages_read < total_pages:
+        result += f"\n[Extraction stopped at page {pages_read} of {total_pages}]"
+        
+        # Stopping early leaves the loader's open document behind; close it and release its buffers now
+        pages.close()
+        del loader, pages, doc
+        gc.collect()
+    
+    logger.info("TOOL: pdf_extract | OUTPUT: Extracted %s pages from PDF", pages_read)
+    return result
 
 
 @tool
-def pdf_extract(file_path: str) -> str:
+async def pdf_extract(file_path: str) -> str:
     """
     Extract text, tables, and structure from PDF documents (research papers, articles).
     
@@ -352,62 +791,75 @@ def pdf_extract(file_path: str) -> str:
     Returns:
         str: Extracted content in markdown format with metadata (title, author, pages)
     """
-    logging.info(f"TOOL: pdf_extract | INPUT: {file_path}")
+    logger.info("TOOL: pdf_extract | INPUT: %s", file_path)
     
     try:
-        # Initialize PyMuPDF4LLM loader
-        loader = PyMuPDF4LLMLoader(
-            file_path,
-            mode="page",  # Split by page for better structure
-            extract_images=False  # Skip images for speed (can enable if needed)
-        )
-        
-        # Load documents
-        docs = loader.load()
-        
-        if not docs:
-            return f"Could not extract content from PDF: {file_path}"
-        
-        # Get metadata from first document
-        metadata = docs[0].metadata
-        
-        # Format results
-        result_parts = [
-            "=== PDF Content Extraction ===",
-            f"Source: {metadata.get('source', 'N/A')}",
-            f"Total Pages: {metadata.get('total_pages', len(docs))}",
-            f"Format: {metadata.get('format', 'N/A')}",
-            f"Created: {metadata.get('creationdate', 'N/A')}",
-            f"Producer: {metadata.get('producer', 'N/A')}",
-            f"\n{'='*50}\n"
-        ]
-        
-        # Add content from each page
-        for doc in docs:
-            page_num = doc.metadata.get('page', 'Unknown')
-            result_parts.append(f"\n--- Page {page_num + 1} ---\n")
-            
-            # Limit content per page to avoid token limits
-            content = doc.page_content
-            if len(content) > 2000:
-                content = content[:2000] + "...\n[Content truncated for length]"
-            
-            result_parts.append(content)
-            result_parts.append(f"\n{'='*50}\n")
-        
-        result = "\n".join(result_parts)
-        
-        logging.info(f"TOOL: pdf_extract | OUTPUT: Extracted {len(docs)} pages from PDF")
-        return result
+        return await _run_blocking(_pdf_extract_impl, file_path)
         
     except Exception as e:
         error_msg = f"Error extracting PDF: {str(e)}"
-        logging.error(f"TOOL: pdf_extract | ERROR: {error_msg}")
+        logger.error("TOOL: pdf_extract | ERROR: %s", error_msg)
         return error_msg
 
 
+# First fenced markdown code block, with or without a "python" tag
+# The closing fence is optional so a truncated reply still yields its code
+_PYTHON_FENCE = re.compile(r"```python3?[ \t]*\n?(.*?)(?:```|\Z)", re.DOTALL)
+_FENCE = re.compile(r"```(?:[\w+-]*[ \t]*\n)?(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _strip_code_fence(code: str) -> str:
+    """
+    Return the code inside a markdown fence, or the whole text if there is none
+    
+    A python fence wins over any other (e.g. a bash install step before it);
+    otherwise the first fence is used, minus its language tag.
+    """
+    match = _PYTHON_FENCE.search(code) or _FENCE.search(code)
+    return match.group(1).strip() if match else code.strip()
+
+
+def _generate_code_impl(task_description: str) -> str:
+    """Ask Cerebras for Python code and strip any markdown fence from the reply"""
+    client = _cerebras_client()
+    if client is None:
+        result = "Error: CEREBRAS_API_KEY environment variable is not set"
+        logger.info("TOOL: generate_code | OUTPUT: %s", result)
+        return result
+    
+    # System prompt for code generation
+    system_prompt = """You are an expert Python programmer. Generate clean, efficient, and well-commented Python code based on the user's request. 
+
+Rules:
+- Only return the Python code, no explanations or markdown
+- Include helpful comments in the code
+- Make the code production-ready and follow best practices
+- If the task is complex, break it into functions
+- Include example usage if appropriate"""
+    
+    # Generate code using Cerebras
+    response = client.chat.completions.create(
+        model="llama-3.3-70b",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": task_description}
+        ]
+    )
+    
+    # Extract the generated code
+    generated_code = response.choices[0].message.content
+    
+    # Clean up the code (remove markdown if present)
+    generated_code = _strip_code_fence(generated_code)
+    
+    result = f"Generated Python code for: {task_description}\n\n{generated_code}"
+    
+    logger.info("TOOL: generate_code | OUTPUT: Generated %s characters of code", len(generated_code))
+    return result
+
+
 @tool
-def generate_code(task_description: str) -> str:
+async def generate_code(task_description: str) -> str:
     """
     Generate Python code using Cerebras AI for a given programming task.
     
@@ -420,67 +872,197 @@ def generate_code(task_description: str) -> str:
     Returns:
         str: Generated Python code ready to use
     """
-    logging.info(f"TOOL: generate_code | INPUT: {task_description}")
+    logger.info("TOOL: generate_code | INPUT: %s", task_description)
     
     try:
-        # Import Cerebras (only when needed)
-        from cerebras.cloud.sdk import Cerebras
-        
-        api_key = os.getenv("CEREBRAS_API_KEY")
-        if not api_key:
-            result = "Error: CEREBRAS_API_KEY environment variable is not set"
-            logging.info(f"TOOL: generate_code | OUTPUT: {result}")
-            return result
-        
-        # Create Cerebras client
-        client = Cerebras(api_key=api_key)
-        
-        # System prompt for code generation
-        system_prompt = """You are an expert Python programmer. Generate clean, efficient, and well-commented Python code based on the user's request. 
-
-Rules:
-- Only return the Python code, no explanations or markdown
-- Include helpful comments in the code
-- Make the code production-ready and follow best practices
-- If the task is complex, break it into functions
-- Include example usage if appropriate"""
-        
-        # Generate code using Cerebras
-        response = client.chat.completions.create(
-            model="llama-3.3-70b",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task_description}
-            ]
-        )
-        
-        # Extract the generated code
-        generated_code = response.choices[0].message.content
-        
-        # Clean up the code (remove markdown if present)
-        if "```python" in generated_code:
-            generated_code = generated_code.split("```python")[1].split("```")[0].strip()
-        elif "```" in generated_code:
-            generated_code = generated_code.split("```")[1].split("```")[0].strip()
-        
-        result = f"Generated Python code for: {task_description}\n\n{generated_code}"
-        
-        logging.info(f"TOOL: generate_code | OUTPUT: Generated {len(generated_code)} characters of code")
-        return result
+        return await _run_blocking(_generate_code_impl, task_description)
         
     except Exception as e:
         result = f"Error generating code: {str(e)}"
-        logging.info(f"TOOL: generate_code | OUTPUT: {result}")
+        logger.info("TOOL: generate_code | OUTPUT: %s", result)
+        return result
+
+
+# One E2B sandbox is kept warm between execute_code calls and killed after this many idle seconds
+SANDBOX_IDLE_TIMEOUT = 600
+
+# Longest a single execute_code run may take
+SANDBOX_RUN_TIMEOUT = 120
+
+# E2B kills a sandbox at a fixed deadline rather than after idling, so every run pushes the
+# deadline past the run itself, the local idle window and one reaper poll
+SANDBOX_LIFETIME = SANDBOX_RUN_TIMEOUT + SANDBOX_IDLE_TIMEOUT + 120
+
+_SANDBOX = None
+_SANDBOX_LOCK = threading.Lock()
+_SANDBOX_LAST_USE = 0.0
+_SANDBOX_ACTIVE_RUNS = 0
+_SANDBOX_REAPER: Optional[threading.Thread] = None
+
+
+def _kill_sandbox():
+    """Kill the warm sandbox, if any (caller must hold _SANDBOX_LOCK)"""
+    global _SANDBOX
+    if _SANDBOX is None:
+        return
+    try:
+        _SANDBOX.kill()
+    except Exception as e:
+        logger.info("TOOL: execute_code | Could not kill sandbox: %s", e)
+    _SANDBOX = None
+
+
+def _reap_idle_sandbox():
+    """Background loop that kills the warm sandbox once it has been idle too long"""
+    while True:
+        time.sleep(60)
+        with _SANDBOX_LOCK:
+            idle = time.monotonic() - _SANDBOX_LAST_USE
+            if _SANDBOX is not None and _SANDBOX_ACTIVE_RUNS == 0 and idle > SANDBOX_IDLE_TIMEOUT:
+                logger.info("TOOL: execute_code | Killing idle sandbox")
+                _kill_sandbox()
+
+
+def _acquire_sandbox():
+    """Return the warm sandbox, creating it on first use, and mark a run as active"""
+    global _SANDBOX, _SANDBOX_REAPER, _SANDBOX_ACTIVE_RUNS
+    from e2b_code_interpreter import Sandbox
+    
+    with _SANDBOX_LOCK:
+        if _SANDBOX is None:
+            _SANDBOX = Sandbox.create(timeout=SANDBOX_LIFETIME)
+            
+            if _SANDBOX_REAPER is None:
+                _SANDBOX_REAPER = threading.Thread(target=_reap_idle_sandbox, name="sandbox-reaper", daemon=True)
+                _SANDBOX_REAPER.start()
+        
+        _SANDBOX_ACTIVE_RUNS += 1
+        return _SANDBOX
+
+
+def _release_sandbox():
+    """Mark a run as finished and restart the idle clock"""
+    global _SANDBOX_ACTIVE_RUNS, _SANDBOX_LAST_USE
+    with _SANDBOX_LOCK:
+        _SANDBOX_ACTIVE_RUNS -= 1
+        _SANDBOX_LAST_USE = time.monotonic()
+
+
+def _discard_sandbox(sandbox):
+    """Drop a sandbox that has died so the next run creates a new one"""
+    with _SANDBOX_LOCK:
+        if _SANDBOX is sandbox:
+            _kill_sandbox()
+
+
+def _sandbox_alive(sandbox) -> bool:
+    """Whether the sandbox is still running (assumed so if its state can't be checked)"""
+    try:
+        return sandbox.is_running()
+    except Exception:
+        return True
+
+
+def _run_code_once(sandbox, code: str):
+    """Run code in a fresh kernel context on the sandbox and remove the context afterwards"""
+    sandbox.set_timeout(SANDBOX_LIFETIME)
+    
+    # A new context per call, so one request never sees another's variables or imports
+    context = sandbox.create_code_context()
+    try:
+        return sandbox.run_code(code, context=context, timeout=SANDBOX_RUN_TIMEOUT)
+    finally:
+        try:
+            sandbox.remove_code_context(context)
+        except Exception as e:
+            logger.info("TOOL: execute_code | Could not remove code context: %s", e)
+
+
+def _run_in_sandbox(code: str):
+    """Run code in the warm sandbox, moving to a new sandbox once if the old one is gone"""
+    import httpx
+    from e2b_code_interpreter import NotFoundException
+    
+    for attempt in range(2):
+        sandbox = _acquire_sandbox()
+        try:
+            return _run_code_once(sandbox, code)
+        except (NotFoundException, httpx.ConnectError) as e:
+            # The sandbox expired or was killed remotely, so the code never ran; safe to retry once
+            _discard_sandbox(sandbox)
+            if attempt:
+                raise
+            logger.info("TOOL: execute_code | Sandbox unavailable (%s), recreating", e)
+        except Exception:
+            # The code may already have run, so never retry; just drop the sandbox if it died
+            if not _sandbox_alive(sandbox):
+                _discard_sandbox(sandbox)
+            raise
+        finally:
+            _release_sandbox()
+
+
+def _shutdown_sandbox():
+    with _SANDBOX_LOCK:
+        _kill_sandbox()
+
+
+atexit.register(_shutdown_sandbox)
+
+
+def _execute_code_impl(python_code: str) -> str:
+    """Run Python code in an E2B sandbox and collect stdout, stderr and results"""
+    api_key = os.getenv("E2B_API_KEY")
+    if not api_key:
+        result = "Error: E2B_API_KEY environment variable is not set"
+        logger.info("TOOL: execute_code | OUTPUT: %s", result)
         return result
+    
+    # Clean up the code (remove markdown if present)
+    clean_code = _strip_code_fence(python_code)
+    
+    # Execute code in the warm E2B sandbox
+    execution = _run_in_sandbox(clean_code)
+    
+    # Collect all output
+    output_parts = []
+    
+    # Add stdout
+    if execution.logs.stdout:
+        stdout = ''.join(execution.logs.stdout).strip()
+        if stdout:
+            output_parts.append(f"Output:\n{stdout}")
+    
+    # Add stderr (errors)
+    if execution.logs.stderr:
+        stderr = ''.join(execution.logs.stderr).strip()
+        if stderr:
+            output_parts.append(f"Errors:\n{stderr}")
+    
+    # Add execution result if available
+    if hasattr(execution, 'results') and execution.results:
+        for result in execution.results:
+            if hasattr(result, 'text') and result.text:
+                output_parts.append(f"Result: {result.text}")
+    
+    # Format final result
+    if output_parts:
+        result = f"Code execution completed:\n\n" + "\n\n".join(output_parts)
+    else:
+        result = "Code executed successfully (no output produced)"
+    
+    logger.info("TOOL: execute_code | OUTPUT: Execution completed, %s chars output", len(result))
+    return result
 
 
 @tool
-def execute_code(python_code: str) -> str:
+async def execute_code(python_code: str) -> str:
     """
     Execute Python code in a secure E2B sandbox environment and return the output.
     
     Use this tool when user asks "what's the output", "run this code", "execute this", 
     or wants to see the result of code execution. Runs code safely in isolation.
+    Every call starts in a fresh Python context, so include all imports and definitions the code needs.
     
     Args:
         python_code: Python code to execute (can be multi-line)
@@ -488,75 +1070,107 @@ def execute_code(python_code: str) -> str:
     Returns:
         str: Execution output including stdout, stderr, and any results
     """
-    logging.info(f"TOOL: execute_code | INPUT: {python_code[:100]}...")
+    logger.info("TOOL: execute_code | INPUT: %s...", python_code[:100])
     
     try:
-        # Import E2B (only when needed)
-        from e2b_code_interpreter import Sandbox
-        
-        api_key = os.getenv("E2B_API_KEY")
-        if not api_key:
-            result = "Error: E2B_API_KEY environment variable is not set"
-            logging.info(f"TOOL: execute_code | OUTPUT: {result}")
-            return result
-        
-        # Clean up the code (remove markdown if present)
-        clean_code = python_code
-        if "```python" in clean_code:
-            clean_code = clean_code.split("```python")[1].split("```")[0].strip()
-        elif "```" in clean_code:
-            clean_code = clean_code.split("```")[1].split("```")[0].strip()
-        
-        # Execute code in E2B Sandbox
-        with Sandbox.create() as sandbox:
-            execution = sandbox.run_code(clean_code)
-            
-            # Collect all output
-            output_parts = []
-            
-            # Add stdout
-            if execution.logs.stdout:
-                stdout = ''.join(execution.logs.stdout).strip()
-                if stdout:
-                    output_parts.append(f"Output:\n{stdout}")
-            
-            # Add stderr (errors)
-            if execution.logs.stderr:
-                stderr = ''.join(execution.logs.stderr).strip()
-                if stderr:
-                    output_parts.append(f"Errors:\n{stderr}")
-            
-            # Add execution result if available
-            if hasattr(execution, 'results') and execution.results:
-                for result in execution.results:
-                    if hasattr(result, 'text') and result.text:
-                        output_parts.append(f"Result: {result.text}")
-            
-            # Format final result
-            if output_parts:
-                result = f"Code execution completed:\n\n" + "\n\n".join(output_parts)
-            else:
-                result = "Code executed successfully (no output produced)"
-            
-            logging.info(f"TOOL: execute_code | OUTPUT: Execution completed, {len(result)} chars output")
-            return result
-            
+        return await _run_blocking(_execute_code_impl, python_code)
+        
     except Exception as e:
         result = f"Error executing code: {str(e)}"
-        logging.info(f"TOOL: execute_code | OUTPUT: {result}")
+        logger.info("TOOL: execute_code | OUTPUT: %s", result)
         return result
 
 
 # # Add imports at the top
-from langchain_community.document_loaders.generic import GenericLoader
-from langchain_community.document_loaders.parsers import LanguageParser
 from langchain_text_splitters import Language
-import tempfile
-import os
-import requests
+
+# Refuse to download source files larger than this
+SOURCE_FILE_MAX_BYTES = 5_000_000
+
+# github.com/<owner>/<repo>/blob/ -> raw.githubusercontent.com/<owner>/<repo>/
+_BLOB = re.compile(r"github\.com/([^/]+/[^/]+)/blob/")
+
+# Known extensions skip LanguageParser's language autodetection
+_EXT_TO_LANG = {
+    "py": Language.PYTHON,
+    "js": Language.JS,
+    "ts": Language.TS,
+    "java": Language.JAVA,
+    "cpp": Language.CPP,
+    "c": Language.C,
+    "go": Language.GO,
+    "rs": Language.RUST,
+}
+
+@disk_cached("analyze_source_code", should_cache=_cacheable, memory_entries=MEMORY_CACHE_ENTRIES)
+def _analyze_source_code_impl(github_url: str) -> str:
+    """Download a source file and format its parsed code components"""
+    # Convert GitHub URL to raw URL if needed
+    raw_url = _BLOB.sub(r"raw.githubusercontent.com/\1/", github_url)
+    
+    # Determine file extension and language (from the path, so query strings are ignored)
+    file_ext = os.path.splitext(urlparse(raw_url).path)[1].lstrip('.').lower()
+    
+    # Create temporary file
+    with tempfile.NamedTemporaryFile(suffix=f'.{file_ext}', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+    
+    try:
+        # Stream the download straight into the temporary file (constant memory)
+        _download_to_file(raw_url, tmp_path, SOURCE_FILE_MAX_BYTES, github_url)
+        
+        # Load and parse the code
+        from langchain_community.document_loaders.generic import GenericLoader
+        from langchain_community.document_loaders.parsers import LanguageParser
+        
+        loader = GenericLoader.from_filesystem(
+            os.path.dirname(tmp_path),
+            glob=os.path.basename(tmp_path),
+            parser=LanguageParser(language=_EXT_TO_LANG.get(file_ext), parser_threshold=50)  # Parse files >50 lines
+        )
+        
+        docs = loader.load()
+        
+        if not docs:
+            return _UncachedText(f"Could not parse code from {github_url}")
+        
+        # Format results
+        buf = io.StringIO()
+        buf.write(
+            "=== Source Code Analysis ===\n"
+            f"Source: {github_url}\n"
+            f"Language: {docs[0].metadata.get('language', 'Unknown')}\n"
+            f"Components found: {len(docs)}\n"
+            f"\n{'='*50}\n"
+        )
+        
+        for i, doc in enumerate(docs, 1):
+            content_type = doc.metadata.get('content_type', 'unknown')
+            buf.write(f"\n\n--- Component {i}: {content_type} ---\n\n")
+            
+            # Limit content length
+            content = doc.page_content
+            if len(content) > 1500:
+                content = content[:1500] + "\n...[truncated]"
+            
+            buf.write(content)
+            buf.write(f"\n\n{'='*50}\n")
+        
+        result = buf.getvalue()
+        
+        buf.close()
+        
+        logger.info("TOOL: analyze_source_code | OUTPUT: Parsed %s code components", len(docs))
+        return result
+        
+    finally:
+        # Clean up temp file
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
 
 @tool
-def analyze_source_code(github_url: str) -> str:
+async def analyze_source_code(github_url: str) -> str:
     """
     Analyze source code from a GitHub repository or file URL.
     
@@ -570,81 +1184,65 @@ def analyze_source_code(github_url: str) -> str:
     Returns:
         str: Parsed code structure with functions and classes separated
     """
-    logging.info(f"TOOL: analyze_source_code | INPUT: {github_url}")
+    logger.info("TOOL: analyze_source_code | INPUT: %s", github_url)
     
     try:
-        # Convert GitHub URL to raw URL if needed
-        if "github.com" in github_url and "/blob/" in github_url:
-            raw_url = github_url.replace("github.com", "raw.githubusercontent.com").replace("/blob/", "/")
-        else:
-            raw_url = github_url
-        
-        # Download the file
-        response = requests.get(raw_url, timeout=10)
-        if response.status_code != 200:
-            return f"Could not download file from {github_url}. Status code: {response.status_code}"
-        
-        # Determine file extension and language
-        file_ext = raw_url.split('.')[-1]
-        
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix=f'.{file_ext}', delete=False) as tmp_file:
-            tmp_file.write(response.text)
-            tmp_path = tmp_file.name
-        
-        try:
-            # Load and parse the code
-            loader = GenericLoader.from_filesystem(
-                os.path.dirname(tmp_path),
-                glob=os.path.basename(tmp_path),
-                parser=LanguageParser(parser_threshold=50)  # Parse files >50 lines
-            )
-            
-            docs = loader.load()
-            
-            if not docs:
-                return f"Could not parse code from {github_url}"
-            
-            # Format results
-            result_parts = [
-                "=== Source Code Analysis ===",
-                f"Source: {github_url}",
-                f"Language: {docs[0].metadata.get('language', 'Unknown')}",
-                f"Components found: {len(docs)}",
-                f"\n{'='*50}\n"
-            ]
-            
-            for i, doc in enumerate(docs, 1):
-                content_type = doc.metadata.get('content_type', 'unknown')
-                result_parts.append(f"\n--- Component {i}: {content_type} ---\n")
-                
-                # Limit content length
-                content = doc.page_content
-                if len(content) > 1500:
-                    content = content[:1500] + "\n...[truncated]"
-                
-                result_parts.append(content)
-                result_parts.append(f"\n{'='*50}\n")
-            
-            result = "\n".join(result_parts)
-            
-            logging.info(f"TOOL: analyze_source_code | OUTPUT: Parsed {len(docs)} code components")
-            return result
-            
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        return await _run_blocking(_analyze_source_code_impl, github_url)
         
     except Exception as e:
         error_msg = f"Error analyzing source code: {str(e)}"
-        logging.error(f"TOOL: analyze_source_code | ERROR: {error_msg}")
+        logger.error("TOOL: analyze_source_code | ERROR: %s", error_msg)
         return error_msg
 
 
 
+@semantic_cached("duckduckgo_search", should_cache=_cacheable)
+def _duckduckgo_search_impl(query: str) -> str:
+    """Run a DuckDuckGo search and format the top 5 results"""
+    from langchain_community.tools import DuckDuckGoSearchResults
+    from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+    
+    # Initialize DuckDuckGo with custom settings
+    wrapper = DuckDuckGoSearchAPIWrapper(
+        max_results=5,  # Return top 5 results
+        region="wt-wt",  # Worldwide (use "us-en" for US, "in-en" for India)
+        safesearch="moderate",  # moderate, strict, or off
+        time="y"  # y=past year, m=past month, w=past week, d=past day
+    )
+    
+    search = DuckDuckGoSearchResults(
+        api_wrapper=wrapper,
+        output_format="list"  # Return as list for better formatting
+    )
+    
+    # Execute search
+    results = search.invoke(query)
+    
+    if not results:
+        return _UncachedText("No results found")
+    
+    # Format results
+    result_parts = [
+        f"=== DuckDuckGo Search Results ===",
+        f"Query: {query}",
+        f"Found: {len(results)} results\n"
+    ]
+    
+    for i, result in enumerate(results, 1):
+        result_parts.append(f"\n--- Result {i} ---")
+        result_parts.append(f"Title: {result.get('title', 'N/A')}")
+        result_parts.append(f"URL: {result.get('link', 'N/A')}")
+        result_parts.append(f"Snippet: {result.get('snippet', 'N/A')}")
+        result_parts.append("-" * 50)
+    
+    final_result = "\n".join(result_parts)
+    
+    logger.info("TOOL: duckduckgo_search | OUTPUT: %s results", len(results))
+    return final_result
+
+
 @tool
-def duckduckgo_search(query: str) -> str:
+async def duckduckgo_search(query: str) -> str:
     """
     Free web search using DuckDuckGo (no API key required).
     
@@ -657,53 +1255,169 @@ def duckduckgo_search(query: str) -> str:
     Returns:
         str: Search results with URLs, titles, and snippets
     """
-    logging.info(f"TOOL: duckduckgo_search | INPUT: {query}")
+    logger.info("TOOL: duckduckgo_search | INPUT: %s", query)
     
     try:
-        # Initialize DuckDuckGo with custom settings
-        wrapper = DuckDuckGoSearchAPIWrapper(
-            max_results=5,  # Return top 5 results
-            region="wt-wt",  # Worldwide (use "us-en" for US, "in-en" for India)
-            safesearch="moderate",  # moderate, strict, or off
-            time="y"  # y=past year, m=past month, w=past week, d=past day
-        )
-        
-        search = DuckDuckGoSearchResults(
-            api_wrapper=wrapper,
-            output_format="list"  # Return as list for better formatting
-        )
-        
-        # Execute search
-        results = search.invoke(query)
-        
-        if not results:
-            return "No results found"
-        
-        # Format results
-        result_parts = [
-            f"=== DuckDuckGo Search Results ===",
-            f"Query: {query}",
-            f"Found: {len(results)} results\n"
-        ]
-        
-        for i, result in enumerate(results, 1):
-            result_parts.append(f"\n--- Result {i} ---")
-            result_parts.append(f"Title: {result.get('title', 'N/A')}")
-            result_parts.append(f"URL: {result.get('link', 'N/A')}")
-            result_parts.append(f"Snippet: {result.get('snippet', 'N/A')}")
-            result_parts.append("-" * 50)
-        
-        final_result = "\n".join(result_parts)
-        
-        logging.info(f"TOOL: duckduckgo_search | OUTPUT: {len(results)} results")
-        return final_result
+        return await _run_blocking(_duckduckgo_search_impl, query)
         
     except Exception as e:
         error_msg = f"DuckDuckGo search failed: {str(e)}"
-        logging.error(f"TOOL: duckduckgo_search | ERROR: {error_msg}")
+        logger.error("TOOL: duckduckgo_search | ERROR: %s", error_msg)
         return error_msg
 
 
+# Search backends that multi_source_search can run in parallel
+SEARCH_BACKENDS = {
+    "tavily": _tavily_search_impl,
+    "wikipedia": _wikipedia_search_impl,
+    "arxiv": _arxiv_search_impl,
+    "pubmed": _pubmed_search_impl,
+    "duckduckgo": _duckduckgo_search_impl,
+}
+
+# Per-backend time limit so one slow source doesn't stall the rest
+SEARCH_BACKEND_TIMEOUT = 15
+
+
+@tool
+async def multi_source_search(query: str, sources: Optional[List[str]] = None) -> str:
+    """
+    Search several sources at once and return all their results together.
+    
+    All selected sources are queried in parallel, so this is much faster than calling
+    each search tool one after another. Use when a query needs more than one type of source
+    (e.g. background knowledge plus latest news, or web results plus research papers).
+    
+    Args:
+        query: The search query string
+        sources: Sources to search, any of "tavily", "wikipedia", "arxiv", "pubmed", "duckduckgo"
+                 (default: tavily, wikipedia, arxiv)
+    
+    Returns:
+        str: Results from each source, one section per source
+    """
+    sources = list(dict.fromkeys(sources or ["tavily", "wikipedia", "arxiv"]))
+    logger.info("TOOL: multi_source_search | INPUT: %s, sources=%s", query, sources)
+    
+    unknown = [source for source in sources if source not in SEARCH_BACKENDS]
+    sources = [source for source in sources if source in SEARCH_BACKENDS]
+    
+    if not sources:
+        result = f"No valid sources given. Choose from: {', '.join(SEARCH_BACKENDS)}"
+        logger.info("TOOL: multi_source_search | OUTPUT: %s", result)
+        return result
+    
+    async def run_backend(source: str) -> str:
+        # The backends are blocking SDK/loader calls, so run each on the tool thread pool
+        return await asyncio.wait_for(
+            _run_blocking(SEARCH_BACKENDS[source], query),
+            timeout=SEARCH_BACKEND_TIMEOUT
+        )
+    
+    results = await asyncio.gather(*(run_backend(s) for s in sources), return_exceptions=True)
+    
+    result_parts = []
+    for source, content in zip(sources, results):
+        result_parts.append(f"=== {source} ===")
+        if isinstance(content, asyncio.TimeoutError):
+            result_parts.append(f"{source} search timed out after {SEARCH_BACKEND_TIMEOUT}s")
+        elif isinstance(content, Exception):
+            result_parts.append(f"{source} search failed: {str(content)}")
+        else:
+            result_parts.append(content)
+        result_parts.append("")
+    
+    if unknown:
+        result_parts.append(f"Skipped unknown sources: {', '.join(unknown)}")
+    
+    result = "\n".join(result_parts)
+    
+    logger.info("TOOL: multi_source_search | OUTPUT: Searched %s sources, total length: %s chars", len(sources), len(result))
+    return result
+
+
+# Most queries a batch tool accepts in one call
+BATCH_MAX_QUERIES = 5
+
+
+async def _run_batch(tool_name: str, impl, queries: List[str]) -> str:
+    """Run one search implementation for several queries in parallel and merge the results"""
+    queries = list(dict.fromkeys(queries))[:BATCH_MAX_QUERIES]
+    logger.info("TOOL: %s | INPUT: %s", tool_name, queries)
+    
+    if not queries:
+        result = "No queries provided"
+        logger.info("TOOL: %s | OUTPUT: %s", tool_name, result)
+        return result
+    
+    results = await asyncio.gather(*(_run_blocking(impl, q) for q in queries), return_exceptions=True)
+    
+    result_parts = []
+    for query, content in zip(queries, results):
+        result_parts.append(f"=== Query: {query} ===")
+        if isinstance(content, Exception):
+            result_parts.append(f"Search failed: {str(content)}")
+        else:
+            result_parts.append(content)
+        result_parts.append("")
+    
+    result = "\n".join(result_parts)
+    
+    logger.info("TOOL: %s | OUTPUT: Ran %s queries, total length: %s chars", tool_name, len(queries), len(result))
+    return result
+
+
+@tool
+async def wikipedia_search_batch(queries: List[str]) -> str:
+    """
+    Search Wikipedia for several topics at once.
+    
+    All queries run in parallel, so this is much faster than calling wikipedia_search
+    once per topic. Use when comparing or covering multiple subjects (up to 5).
+    
+    Args:
+        queries: List of search queries, one per topic
+    
+    Returns:
+        str: Wikipedia results for each query, one section per query
+    """
+    return await _run_batch("wikipedia_search_batch", _wikipedia_search_impl, queries)
+
+
+@tool
+async def arxiv_search_batch(queries: List[str]) -> str:
+    """
+    Search arXiv for several research questions at once.
+    
+    All queries run in parallel, so this is much faster than calling arxiv_search
+    once per question. Use when a topic needs papers on multiple subtopics (up to 5).
+    
+    Args:
+        queries: List of search queries or arXiv IDs
+    
+    Returns:
+        str: Paper summaries for each query, one section per query
+    """
+    return await _run_batch("arxiv_search_batch", _arxiv_search_impl, queries)
+
+
+@tool
+async def pubmed_search_batch(queries: List[str]) -> str:
+    """
+    Search PubMed for several medical or biology questions at once.
+    
+    All queries run in parallel, so this is much faster than calling pubmed_search
+    once per question. Use when a topic needs studies on multiple subtopics (up to 5).
+    
+    Args:
+        queries: List of search queries
+    
+    Returns:
+        str: Article abstracts for each query, one section per query
+    """
+    return await _run_batch("pubmed_search_batch", _pubmed_search_impl, queries)
+
+
 # @tool
 # def pdf_vision_extract(file_path: str) -> str:
 #     """
@@ -724,7 +1438,7 @@ def duckduckgo_search(query: str) -> str:
 #     Returns:
 #         str: Extracted content in markdown format with visual understanding
 #     """
-#     logging.info(f"TOOL: pdf_vision_extract | INPUT: {file_path}")
+#     logger.info("TOOL: pdf_vision_extract | INPUT: %s", file_path)
     
 #     try:
 #         import nest_asyncio
@@ -777,12 +1491,12 @@ def duckduckgo_search(query: str) -> str:
         
 #         result = "\n".join(result_parts)
         
-#         logging.info(f"TOOL: pdf_vision_extract | OUTPUT: Extracted {len(docs)} pages using Gemini vision")
+#         logger.info("TOOL: pdf_vision_extract | OUTPUT: Extracted %s pages using Gemini vision", len(docs))
 #         return result
         
 #     except Exception as e:
 #         error_msg = f"Error extracting PDF with vision: {str(e)}"
-#         logging.error(f"TOOL: pdf_vision_extract | ERROR: {error_msg}")
+#         logger.error("TOOL: pdf_vision_extract | ERROR: %s", error_msg)
 #         return error_msg
 
 
@@ -792,12 +1506,17 @@ def get_tools():
     return [
         tavily_search, 
         fetch_url_content, 
+        fetch_urls_content,
         wikipedia_search, 
+        wikipedia_search_batch,
         arxiv_search, 
+        arxiv_search_batch,
         youtube_transcript, 
         pubmed_search, 
+        pubmed_search_batch,
         pdf_extract,
         duckduckgo_search,
+        multi_source_search,
         analyze_source_code,
         generate_code,
         execute_code